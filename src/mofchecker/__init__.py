@@ -1,21 +1,23 @@
 # -*- coding: utf-8 -*-
 """Basic sanity checks for MOFs."""
 import os
+import threading
 import warnings
 from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import networkx as nx
+import numpy as np
 from ase import Atoms
-from backports.cached_property import cached_property
 from pymatgen.analysis.graphs import ConnectedSite, StructureGraph
 from pymatgen.core import IStructure, Structure
 from pymatgen.io.ase import AseAtomsAdaptor
 from pymatgen.io.cif import CifParser
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
-from structuregraph_helpers.analysis import get_cn
-from structuregraph_helpers.create import construct_clean_graph, get_structure_graph
+from pymatgen.symmetry.structure import SymmetrizedStructure
+from structuregraph_helpers.create import construct_clean_graph
 from structuregraph_helpers.hash import (
     decorated_graph_hash,
     decorated_scaffold_hash,
@@ -45,45 +47,123 @@ from .checks.local_structure import (
     UnderCoordinatedNitrogenCheck,
 )
 from .checks.oms import MOFOMS
+from .checks.registry import CheckRegistry
 from .checks.utils.get_indices import get_c_indices, get_h_indices, get_metal_indices, get_n_indices
 from .checks.zeopp import PorosityCheck
-from .symmetry import get_spacegroup_symbol_and_number, get_symmetry_hash
-from .utils import _check_if_ordered
+from .descriptors import DESCRIPTOR_DEPENDENCIES, DESCRIPTORS, PROFILES, plan_artifacts
+from .errors import PrescreenFailed
+from .graph import (
+    NATIVE_METHODS,
+    NeighborList,
+    PeriodicAdjacency,
+    PeriodicComponents,
+    get_largest_cutoff,
+    get_structure_graph,
+)
+from .screening import prescreen as _prescreen
+from .symmetry import (
+    ANGLE_TOLERANCE,
+    SYMPREC,
+    SymmetryDataset,
+    get_symmetrized_structure,
+    get_symmetry_dataset,
+    get_symmetry_hash,
+)
+from .utils import _check_if_ordered, cached_property
 from .version import get_version
 
 __version__ = get_version()
 
-__all__ = ["__version__", "MOFChecker", "DESCRIPTORS"]
-
-
-DESCRIPTORS = [
-    "name",
-    "graph_hash",
-    "undecorated_graph_hash",
-    "decorated_scaffold_hash",
-    "undecorated_scaffold_hash",
-    "symmetry_hash",
-    "formula",
-    "path",
-    "density",
-    "has_carbon",
-    "has_hydrogen",
-    "has_atomic_overlaps",
-    "has_overcoordinated_c",
-    "has_overcoordinated_n",
-    "has_overcoordinated_h",
-    "has_undercoordinated_c",
-    "has_undercoordinated_n",
-    "has_undercoordinated_rare_earth",
+# public name of the pre-screen, the constructors have an argument of the same name
+prescreen = _prescreen
+
+__all__ = [
+    "__version__",
+    "MOFChecker",
+    "DESCRIPTORS",
+    "DESCRIPTOR_DEPENDENCIES",
+    "PROFILES",
+    "SCREENING_CHECKS",
+    "prescreen",
+]
+
+
+def _structure_check(check_class):
+    """Return a factory for a check that only needs the structure."""
+    return lambda mofchecker: check_class(mofchecker.structure)
+
+
+_CHECK_FACTORIES = {
+    "has_c": _structure_check(HasCarbon),
+    "has_h": _structure_check(HasHydrogen),
+    "has_metal": _structure_check(HasMetal),
+    "has_nitrogen": _structure_check(HasNitrogen),
+    "no_atomic_overlaps": AtomicOverlapCheck.from_mofchecker,
+    "no_undercoordinated_carbon": UnderCoordinatedCarbonCheck.from_mofchecker,
+    "no_overcoordinated_carbon": OverCoordinatedCarbonCheck.from_mofchecker,
+    "no_overcoordinated_hydrogen": OverCoordinatedHydrogenCheck.from_mofchecker,
+    "no_overcoordinated_nitrogen": OverCoordinatedNitrogenCheck.from_mofchecker,
+    "no_undercoordinated_nitrogen": UnderCoordinatedNitrogenCheck.from_mofchecker,
+    "no_undercoordinated_rare_earth": UnderCoordinatedRareEarthCheck.from_mofchecker,
+    "no_undercoordinated_alkali_alkaline": UnderCoordinatedAlkaliAlkaline.from_mofchecker,
+    "no_geometrically_exposed_metal": GeometricallyExposedMetal.from_mofchecker,
+    "no_floating_molecule": FloatingSolventCheck.from_mofchecker,
+    "no_high_charges": _structure_check(ChargeCheck),
+    "is_porous": _structure_check(PorosityCheck),
+    "no_oms": MOFOMS.from_mofchecker,
+    "no_false_terminal_oxo": FalseOxoCheck.from_mofchecker,
+    "has_3d_connected_graph": IsThreeDimensional.from_mofchecker,
+}
+
+# checks that a structure should pass, ordered by their cost:
+# composition, overlaps (distance matrix), coordination (structure graph),
+# connectivity (graph components and periodicity), external tools (zeo++, EqEq)
+SCREENING_CHECKS = (
+    "has_c",
+    "has_h",
     "has_metal",
-    "has_lone_molecule",
-    "has_high_charges",
+    "no_atomic_overlaps",
+    "no_overcoordinated_hydrogen",
+    "no_undercoordinated_carbon",
+    "no_overcoordinated_carbon",
+    "no_overcoordinated_nitrogen",
+    "no_undercoordinated_nitrogen",
+    "no_undercoordinated_rare_earth",
+    "no_undercoordinated_alkali_alkaline",
+    "no_false_terminal_oxo",
+    "no_geometrically_exposed_metal",
+    "no_floating_molecule",
+    "has_3d_connected_graph",
     "is_porous",
-    "has_suspicicious_terminal_oxo",
-    "has_undercoordinated_alkali_alkaline",
-    "has_geometrically_exposed_metal",
+    "no_high_charges",
+)
+
+# checks that run the external tools, by artifact (see mofchecker.descriptors.ARTIFACTS)
+_TOOL_CHECKS = {"zeopp": "is_porous", "eqeq": "no_high_charges"}
+
+# checks that use the structure graph, they are created again if the bonding method changes
+_GRAPH_CHECKS = (
+    "no_undercoordinated_carbon",
+    "no_overcoordinated_carbon",
+    "no_overcoordinated_nitrogen",
+    "no_undercoordinated_nitrogen",
+    "no_undercoordinated_rare_earth",
+    "no_undercoordinated_alkali_alkaline",
+    "no_geometrically_exposed_metal",
+    "no_floating_molecule",
+    "no_oms",
+    "no_false_terminal_oxo",
     "has_3d_connected_graph",
-]
+)
+
+
+def _get_bonding_key(
+    method: Union[str, Tuple[str, Optional[float]]]
+) -> Tuple[str, Optional[float]]:
+    if isinstance(method, str):
+        return method.lower(), None
+    name, tolerance = method
+    return name.lower(), tolerance
 
 
 class MOFChecker:
@@ -95,6 +175,9 @@ class MOFChecker:
         symprec: float = 0.5,
         angle_tolerance: float = 5,
         primitive: bool = True,
+        defer_symmetrization: bool = False,
+        prescreen: bool = False,  # pylint:disable=redefined-outer-name
+        background_tools: bool = False,
     ):
         """Construct a MOFChecker instance.
 
@@ -104,17 +187,36 @@ class MOFChecker:
             angle_tolerance (float): Angle tolerance
             primitive (bool): If True,
                 use primitive cell for structure
+            defer_symmetrization (bool): If True, skip the symmetry analysis
+                in the constructor. The symmetrized structure is then only computed
+                if a symmetry descriptor (e.g., `symmetry_hash`) is requested.
+                The sites are not changed by the symmetry analysis,
+                hence all descriptors are the same. Defaults to False.
+            prescreen (bool): If True, run the checks that do not need a structure graph
+                (see :py:func:`~mofchecker.screening.prescreen`) on the structure
+                before it is symmetrized or reduced. Defaults to False.
+            background_tools (bool): If True, :py:meth:`get_mof_descriptors` runs
+                the external tools (zeo++ and EqEq) in background threads while the
+                other checks are computed. Defaults to False.
 
         Raises:
             NotImplementedError in the case of partial occupancies
+            PrescreenFailed: If `prescreen` is True and the structure fails the pre-screen
         """
-        _check_if_ordered(structure)
-
-        if (symprec is not None) or (angle_tolerance is not None):
+        if prescreen:
+            passed, failed = _prescreen(structure)
+            if not passed:
+                raise PrescreenFailed(failed)
+        else:
+            _check_if_ordered(structure)
+
+        symmetrized = None
+        if not defer_symmetrization and (symprec is not None or angle_tolerance is not None):
             try:
-                structure = SpacegroupAnalyzer(
+                symmetrized = SpacegroupAnalyzer(
                     structure, symprec=symprec, angle_tolerance=angle_tolerance
                 ).get_symmetrized_structure()
+                structure = symmetrized
             except TypeError:
                 # If symmetrization fails
                 pass
@@ -126,6 +228,15 @@ class MOFChecker:
             structure = IStructure.from_sites(structure)
 
         self.structure = structure
+        # symmetrized versions of self.structure, by (symprec, angle_tolerance).
+        # The analysis above can be reused if the sites were not reduced afterwards
+        self._symmetrized_structures = {}
+        # spacegroups and Wyckoff letters of self.structure, by (symprec, angle_tolerance)
+        self._symmetry_datasets = {}
+        if symmetrized is not None and not primitive:
+            key = (symprec, angle_tolerance)
+            self._symmetrized_structures[key] = symmetrized
+            self._symmetry_datasets[key] = SymmetryDataset.from_symmetrized_structure(symmetrized)
 
         self.metal_indices = get_metal_indices(self.structure)
 
@@ -133,6 +244,7 @@ class MOFChecker:
         self._porous = ""
         self.metal_features = None
         self._cnn_method = "vesta"
+        self._cnn_tolerance = None
         self._filename = None
         self._name = None
         self.c_indices = get_c_indices(self.structure)
@@ -144,36 +256,24 @@ class MOFChecker:
 
         self._graph = None
         self._nx_graph = None
-
+        # structure graphs by bonding method and tolerance
+        self._graphs = {}
+        # pairs up to the largest cutoff of the native bonding methods used so far
+        self._neighbor_list = None
+        # guards the construction of the graphs, which are shared by all checks
+        self._graph_lock = threading.Lock()
+
+        self._adjacency = None
+        self._coordination_numbers = None
+        self._components = None
         self._connected_sites = {}
-        self._cns = {}
-        self._checks = {
-            "has_c": HasCarbon(self.structure),
-            "has_h": HasHydrogen(self.structure),
-            "has_metal": HasMetal(self.structure),
-            "has_nitrogen": HasNitrogen(self.structure),
-            "no_atomic_overlaps": AtomicOverlapCheck(self.structure),
-            "no_undercoordinated_carbon": UnderCoordinatedCarbonCheck.from_mofchecker(self),
-            "no_overcoordinated_carbon": OverCoordinatedCarbonCheck.from_mofchecker(self),
-            "no_overcoordinated_hydrogen": OverCoordinatedHydrogenCheck.from_mofchecker(self),
-            "no_overcoordinated_nitrogen": OverCoordinatedNitrogenCheck.from_mofchecker(self),
-            "no_undercoordinated_nitrogen": UnderCoordinatedNitrogenCheck.from_mofchecker(self),
-            "no_undercoordinated_rare_earth": UnderCoordinatedRareEarthCheck.from_mofchecker(self),
-            "no_undercoordinated_alkali_alkaline": UnderCoordinatedAlkaliAlkaline.from_mofchecker(
-                self
-            ),
-            "no_geometrically_exposed_metal": GeometricallyExposedMetal.from_mofchecker(self),
-            "no_floating_molecule": FloatingSolventCheck.from_mofchecker(self),
-            "no_high_charges": ChargeCheck(self.structure),
-            "is_porous": PorosityCheck(self.structure),
-            "no_oms": MOFOMS.from_mofchecker(self),
-            "no_false_terminal_oxo": FalseOxoCheck.from_mofchecker(self),
-            "has_3d_connected_graph": IsThreeDimensional.from_mofchecker(self),
-        }
-
-    @property
-    def checks(self):
-        """Get a dictionary of all check classes."""
+        self._background_tools = background_tools
+        # checks (and the structure graph) are only created when needed
+        self._checks = CheckRegistry(self, _CHECK_FACTORIES)
+
+    @property
+    def checks(self) -> CheckRegistry:
+        """Get a mapping of all checks, which are created on first access."""
         return self._checks
 
     def _set_filename(self, path):
@@ -195,17 +295,17 @@ class MOFChecker:
         Returns:
             str: Graph hash
         """
-        return decorated_graph_hash(self._graph, lqg=False)
+        return decorated_graph_hash(self.graph, lqg=False)
 
     @property
     def spacegroup_symbol(self) -> str:
         """Return the international spacegroup symbol."""
-        return get_spacegroup_symbol_and_number(self.structure)["symbol"]
+        return self.get_symmetry_dataset().symbol
 
     @property
     def spacegroup_number(self) -> int:
         """Return the international spacegroup number."""
-        return get_spacegroup_symbol_and_number(self.structure)["number"]
+        return self.get_symmetry_dataset().number
 
     @cached_property
     def symmetry_hash(self) -> str:
@@ -216,7 +316,69 @@ class MOFChecker:
         Returns:
             str: Symmetry hash
         """
-        return get_symmetry_hash(self.structure)
+        return get_symmetry_hash(self.get_symmetry_dataset())
+
+    @property
+    def symmetrized_structure(self) -> SymmetrizedStructure:
+        """Return the symmetrized structure (with the tolerances of the symmetry descriptors)."""
+        return self.get_symmetrized_structure()
+
+    def get_symmetry_dataset(
+        self, symprec: float = SYMPREC, angle_tolerance: float = ANGLE_TOLERANCE
+    ) -> SymmetryDataset:
+        """Return the spacegroup and the Wyckoff letters that the symmetry descriptors use.
+
+        spglib is called directly on the arrays of the structure, which is much cheaper
+        than building a symmetrized structure. The result is kept per instance and pair
+        of tolerances, an existing symmetrized structure (e.g., of the analysis
+        in the constructor) is reused.
+
+        Args:
+            symprec (float): Symmetry precision. Defaults to 0.01.
+            angle_tolerance (float): Angle tolerance. Defaults to 5.
+
+        Returns:
+            SymmetryDataset: spacegroup number and symbol and the Wyckoff letters
+        """
+        key = (symprec, angle_tolerance)
+        try:
+            return self._symmetry_datasets[key]
+        except KeyError:
+            if key in self._symmetrized_structures:
+                dataset = SymmetryDataset.from_symmetrized_structure(
+                    self._symmetrized_structures[key]
+                )
+            else:
+                dataset = get_symmetry_dataset(self.structure, symprec, angle_tolerance)
+            return self._symmetry_datasets.setdefault(key, dataset)
+
+    def get_symmetrized_structure(
+        self, symprec: float = SYMPREC, angle_tolerance: float = ANGLE_TOLERANCE
+    ) -> SymmetrizedStructure:
+        """Return the symmetrized structure (with spacegroup and equivalent sites).
+
+        The symmetry analysis runs once per instance and pair of tolerances,
+        the result of the analysis in the constructor is reused if the tolerances match
+        and the structure was not reduced to the primitive cell.
+
+        Args:
+            symprec (float): Symmetry precision. Defaults to 0.01.
+            angle_tolerance (float): Angle tolerance. Defaults to 5.
+
+        Returns:
+            SymmetrizedStructure: symmetrized structure
+        """
+        key = (symprec, angle_tolerance)
+        try:
+            return self._symmetrized_structures[key]
+        except KeyError:
+            symmetrized = get_symmetrized_structure(self.structure, symprec, angle_tolerance)
+            return self._symmetrized_structures.setdefault(key, symmetrized)
+
+    @cached_property
+    def distance_matrix(self) -> np.ndarray:
+        """Return the matrix of all pairwise distances (with periodic boundary conditions)."""
+        return self.structure.distance_matrix
 
     @property
     def undercoordinated_c_candidate_positions(self) -> Iterable[Iterable[float]]:
@@ -247,7 +409,7 @@ class MOFChecker:
         Returns:
             str: Graph hash without atomic kinds
         """
-        return undecorated_graph_hash(self._graph, lqg=False)
+        return undecorated_graph_hash(self.graph, lqg=False)
 
     @property
     def decorated_scaffold_hash(self) -> str:
@@ -261,7 +423,7 @@ class MOFChecker:
         Returns:
             str: Graph hash for the scaffold
         """
-        return decorated_scaffold_hash(self._graph, lqg=False)
+        return decorated_scaffold_hash(self.graph, lqg=False)
 
     @property
     def undecorated_scaffold_hash(self) -> str:
@@ -277,7 +439,7 @@ class MOFChecker:
         Returns:
             str: Graph hash for the undecorated scaffold
         """
-        return undecorated_scaffold_hash(self._graph, lqg=False)
+        return undecorated_scaffold_hash(self.graph, lqg=False)
 
     @property
     def has_atomic_overlaps(self) -> bool:
@@ -462,17 +624,155 @@ class MOFChecker:
     def nx_graph(self) -> nx.Graph:
         """Return a networkx graph with atom numbers as node labels."""
         if self._nx_graph is None:
-            _ = self.graph
+            self._nx_graph = construct_clean_graph(self.graph)
         return self._nx_graph
 
     @property
     def graph(self) -> StructureGraph:
-        """Return a pymatgen structure graph."""
+        """Return a pymatgen structure graph (with the bonding method set by `_set_cnn`)."""
         if self._graph is None:
-            self._graph = get_structure_graph(self.structure, self._cnn_method)
-            self._nx_graph = construct_clean_graph(self._graph)
+            self._graph = self._get_graph(self._cnn_method, self._cnn_tolerance)
         return self._graph
 
+    def get_graph(
+        self, method: Optional[str] = None, tolerance: Optional[float] = None
+    ) -> StructureGraph:
+        """Return the structure graph of a bonding method.
+
+        The graphs are kept per method and tolerance. The graphs of the
+        native methods (see :py:data:`~mofchecker.graph.bonding.NATIVE_METHODS`)
+        are derived from one neighbor search, which is only repeated
+        if a method needs a larger cutoff.
+
+        Args:
+            method (str, optional): Bonding method, see :py:meth:`_set_cnn`.
+                Defaults to None, i.e., the method of :py:attr:`graph`.
+            tolerance (float, optional): Relative tolerance of the cutoffs of a native method.
+                Defaults to None, i.e., the default tolerance of the method.
+
+        Returns:
+            StructureGraph: The structure graph.
+        """
+        if method is None:
+            method = self._cnn_method
+            if tolerance is None:
+                tolerance = self._cnn_tolerance
+        return self._get_graph(method.lower(), tolerance)
+
+    def _get_neighbor_list(self, keys: Iterable[Tuple[str, Optional[float]]]) -> NeighborList:
+        # call with the graph lock
+        radius = get_largest_cutoff(self.structure, keys)
+        if self._neighbor_list is None or self._neighbor_list.radius < radius:
+            self._neighbor_list = NeighborList.from_structure(self.structure, radius)
+        return self._neighbor_list
+
+    def _get_graph(self, method: str, tolerance: Optional[float]) -> StructureGraph:
+        key = (method, tolerance)
+        try:
+            return self._graphs[key]
+        except KeyError:
+            pass
+        with self._graph_lock:
+            if key not in self._graphs:
+                if method in NATIVE_METHODS:
+                    neighbor_list = self._get_neighbor_list([key])
+                    graph = get_structure_graph(self.structure, method, tolerance, neighbor_list)
+                else:
+                    graph = get_structure_graph(self.structure, method, tolerance)
+                # node indices for the analysis of connected components,
+                # set before the graph is shared with the checks
+                indices = {index: index for index in range(len(graph))}
+                nx.set_node_attributes(graph.graph, name="idx", values=indices)
+                self._graphs[key] = graph
+        return self._graphs[key]
+
+    def compare_bonding(
+        self, methods: Iterable[Union[str, Tuple[str, float]]]
+    ) -> Dict[int, Dict[str, object]]:
+        """Compare the bonds of several bonding methods site by site.
+
+        The graphs of the native methods are derived from one neighbor search
+        up to the largest cutoff of all methods, and kept for :py:meth:`get_graph`.
+
+        Args:
+            methods (Iterable[Union[str, Tuple[str, float]]]): Bonding methods,
+                a name or a pair of name and tolerance, e.g.,
+                `["vesta", ("covalent_radius", 0.1), ("covalent_radius", 0.2)]`.
+
+        Returns:
+            Dict[int, Dict[str, object]]: For every site whose bonds differ between the
+                methods: the coordination number per method (`coordination_numbers`)
+                and the bonds that only some methods find (`disputed_bonds`,
+                with the neighbor index, its image and the methods).
+                Methods with a tolerance are labeled `<method>:<tolerance>`.
+        """
+        keys = [_get_bonding_key(method) for method in methods]
+        labels = [name if tolerance is None else f"{name}:{tolerance}" for name, tolerance in keys]
+        with self._graph_lock:
+            self._get_neighbor_list(keys)
+        adjacencies = [
+            PeriodicAdjacency.from_structure_graph(self._get_graph(*key)) for key in keys
+        ]
+
+        report = {}
+        for site_index in range(len(self.structure)):
+            bonds = []
+            for adjacency in adjacencies:
+                row = slice(adjacency.indptr[site_index], adjacency.indptr[site_index + 1])
+                images = map(tuple, adjacency.images[row].tolist())
+                bonds.append(set(zip(adjacency.indices[row].tolist(), images)))
+            disputed = set.union(set(), *bonds) - set.intersection(*bonds) if bonds else set()
+            if not disputed:
+                continue
+            report[site_index] = {
+                "coordination_numbers": dict(zip(labels, map(len, bonds))),
+                "disputed_bonds": [
+                    {
+                        "neighbor": neighbor,
+                        "image": image,
+                        "methods": [
+                            label
+                            for label, method_bonds in zip(labels, bonds)
+                            if (neighbor, image) in method_bonds
+                        ],
+                    }
+                    for neighbor, image in sorted(disputed)
+                ],
+            }
+        return report
+
+    @property
+    def adjacency(self) -> PeriodicAdjacency:
+        """Return the bonds of the structure graph in compact (CSR) form.
+
+        The coordination checks read the neighbors of the sites from it
+        instead of creating the connected sites of the structure graph.
+        """
+        if self._adjacency is None:
+            # if two threads build it at the same time, both results are the same
+            self._adjacency = PeriodicAdjacency.from_structure_graph(self.graph)
+        return self._adjacency
+
+    @property
+    def coordination_numbers(self) -> np.ndarray:
+        """Return the coordination numbers of all sites (read-only)."""
+        if self._coordination_numbers is None:
+            coordination_numbers = self.adjacency.coordination_numbers
+            coordination_numbers.flags.writeable = False
+            self._coordination_numbers = coordination_numbers
+        return self._coordination_numbers
+
+    @property
+    def components(self) -> PeriodicComponents:
+        """Return the connected components of the structure graph and their dimensionality.
+
+        The floating molecule and the dimensionality checks share this analysis,
+        which needs no supercell.
+        """
+        if self._components is None:
+            self._components = PeriodicComponents.from_adjacency(self.adjacency)
+        return self._components
+
     def get_connected_sites(self, site_index: int) -> List[ConnectedSite]:
         """Get connected sites for given index.
 
@@ -484,26 +784,23 @@ class MOFChecker:
         Returns:
             List[ConnectedSite]: List of connected sites.
         """
-        if site_index not in self._connected_sites:
-            self._connected_sites[site_index] = self.graph.get_connected_sites(site_index)
-        return self._connected_sites[site_index]
+        try:
+            return self._connected_sites[site_index]
+        except KeyError:
+            connected_sites = self.graph.get_connected_sites(site_index)
+            # if another thread was faster, its result is returned
+            return self._connected_sites.setdefault(site_index, connected_sites)
 
     def get_cn(self, site_index: int) -> int:
         """Get coordination number for site.
 
-        Uses internal cache for speedup.
-
         Args:
             site_index (int): index of site in pymatgen Structure
 
         Returns:
             int: Coordination number
         """
-        if site_index not in self._cns:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                self._cns[site_index] = get_cn(self.graph, site_index)
-        return self._cns[site_index]
+        return int(self.coordination_numbers[site_index])
 
     @property
     def has_overvalent_n(self) -> bool:
@@ -531,8 +828,11 @@ class MOFChecker:
         return not self.checks["no_floating_molecule"].is_ok
 
     @property
-    def lone_molecule_indices(self) -> List[int]:
-        """Return indices of non-periodic connected component in the structure."""
+    def lone_molecule_indices(self) -> List[List[int]]:
+        """Return indices of non-periodic connected component in the structure.
+
+        Every molecule appears once, with its site indices in ascending order.
+        """
         return self.checks["no_floating_molecule"].flagged_indices
 
     @classmethod
@@ -549,6 +849,9 @@ class MOFChecker:
         symprec: float = 0.5,
         angle_tolerance: float = 5,
         primitive: bool = False,
+        defer_symmetrization: bool = False,
+        prescreen: bool = False,  # pylint:disable=redefined-outer-name
+        background_tools: bool = False,
     ) -> "MOFChecker":
         """Create a MOFChecker instance from a CIF file.
 
@@ -557,6 +860,9 @@ class MOFChecker:
             symprec (float): Symmetry tolerance
             angle_tolerance (float): Angle tolerance
             primitive (bool): Whether to use primitive cell
+            defer_symmetrization (bool): Skip the symmetry analysis in the constructor
+            prescreen (bool): Drop structures that fail the pre-screen (see constructor)
+            background_tools (bool): Run zeo++ and EqEq in background threads
 
         Returns:
             MOFChecker: Instance of MOFChecker
@@ -566,14 +872,27 @@ class MOFChecker:
             cifparser = CifParser(path)
             structure = cifparser.get_structures()[0]
             omscls = cls(
-                structure, symprec=symprec, angle_tolerance=angle_tolerance, primitive=primitive
+                structure,
+                symprec=symprec,
+                angle_tolerance=angle_tolerance,
+                primitive=primitive,
+                defer_symmetrization=defer_symmetrization,
+                prescreen=prescreen,
+                background_tools=background_tools,
             )
             omscls._set_filename(path)  #
             return omscls
 
     @classmethod
     def from_ase(
-        cls, atoms: Atoms, symprec: float = 0.5, angle_tolerance: float = 5, primitive: bool = False
+        cls,
+        atoms: Atoms,
+        symprec: float = 0.5,
+        angle_tolerance: float = 5,
+        primitive: bool = False,
+        defer_symmetrization: bool = False,
+        prescreen: bool = False,  # pylint:disable=redefined-outer-name
+        background_tools: bool = False,
     ) -> "MOFChecker":
         """Create a MOFChecker instance from an ASE atoms object.
 
@@ -582,6 +901,9 @@ class MOFChecker:
             symprec (float): Symmetry tolerance
             angle_tolerance (float): Angle tolerance
             primitive (bool): Whether to use primitive cell
+            defer_symmetrization (bool): Skip the symmetry analysis in the constructor
+            prescreen (bool): Drop structures that fail the pre-screen (see constructor)
+            background_tools (bool): Run zeo++ and EqEq in background threads
 
         Returns:
             MOFChecker: Instance of MOFChecker
@@ -589,10 +911,83 @@ class MOFChecker:
         adaptor = AseAtomsAdaptor()
         structure = adaptor.get_structure(atoms)
         omscls = cls(
-            structure, symprec=symprec, angle_tolerance=angle_tolerance, primitive=primitive
+            structure,
+            symprec=symprec,
+            angle_tolerance=angle_tolerance,
+            primitive=primitive,
+            defer_symmetrization=defer_symmetrization,
+            prescreen=prescreen,
+            background_tools=background_tools,
         )
         return omscls
 
+    @staticmethod
+    def check_many(
+        paths_or_structures: Iterable[Union[str, Path, Structure, IStructure]],
+        descriptors: List[str] = None,
+        workers: int = None,
+        chunksize: int = 1,
+        timeout: float = None,
+        max_memory: Union[int, str] = None,
+        max_tasks_per_worker: int = None,
+        checkpoint: str = None,
+        shard: str = None,
+        schedule: str = "size",
+        executor: Union[str, Executor] = None,
+        **kwargs,
+    ) -> Iterator[OrderedDict]:
+        """Run the checks on many structures in parallel.
+
+        Failures for single structures (e.g., a :py:class:`~mofchecker.errors.NoMetal`
+        or a parsing error) are recorded in the result row of this structure.
+        Results are yielded as they complete.
+
+        Args:
+            paths_or_structures (Iterable[Union[str, Path, Structure, IStructure]]):
+                Paths to CIF files or pymatgen structures.
+            descriptors (List[str]): If provided, compute only the passed descriptors
+            workers (int): Number of worker processes. Defaults to the number of CPUs.
+            chunksize (int): Number of structures sent to a worker at once
+            timeout (float): Wall-clock limit per structure in seconds.
+                Structures that exceed it get the status `timeout`.
+            max_memory (Union[int, str]): Memory limit per worker in bytes or
+                as string like `4G`. Structures that exceed it get the status `oom`.
+            max_tasks_per_worker (int): Replace workers after this number of structures
+            checkpoint (str): Path to a manifest in which finished files are recorded.
+                Files that are already recorded for the same settings are skipped.
+            shard (str): Check only shard `i/N` (counted from zero) of the inputs,
+                based on a stable hash of the paths.
+            schedule (str): Dispatch the largest structures first (`size`)
+                or in input order (`input`). Defaults to `size`.
+            executor (Union[str, Executor]): Backend (`serial`, `thread` or `process`)
+                or an executor instance. Defaults to a process pool
+                (or `serial` for one worker).
+            **kwargs: Passed to the MOFChecker constructor
+
+        Raises:
+            ValueError: If an argument is invalid, already when `check_many` is called
+
+        Returns:
+            Iterator[OrderedDict]: result rows with the keys `index`, `input`,
+                `status`, `error` and `descriptors`
+        """
+        from .batch import check_many  # pylint:disable=import-outside-toplevel
+
+        return check_many(
+            paths_or_structures,
+            descriptors=descriptors,
+            workers=workers,
+            chunksize=chunksize,
+            timeout=timeout,
+            max_memory=max_memory,
+            max_tasks_per_worker=max_tasks_per_worker,
+            checkpoint=checkpoint,
+            shard=shard,
+            schedule=schedule,
+            executor=executor,
+            **kwargs,
+        )
+
     @property
     def has_metal(self) -> bool:
         """Return True if the structure has a metal."""
@@ -603,14 +998,72 @@ class MOFChecker:
         """Return true if open metal sites are detected."""
         return not self.checks["no_oms"].is_ok
 
-    def _set_cnn(self, method="vesta"):
-        if self._cnn_method == method.lower():
+    def _set_cnn(self, method="vesta", tolerance: Optional[float] = None):
+        """Set the bonding method of the structure graph.
+
+        The checks that use the structure graph are computed again
+        with the new graph, the graphs of all methods are kept.
+
+        Args:
+            method (str): A native method, i.e., `vesta` (with one vectorized neighbor
+                search, the same graph as the `vesta` method of structuregraph_helpers),
+                its alias `fast_vesta` or `covalent_radius`, or a method of
+                structuregraph_helpers that is not based on cutoffs, e.g., `voronoi`
+                or `minimumdistance`. Defaults to `vesta`.
+            tolerance (float, optional): Relative tolerance of the cutoffs of a native method.
+                Defaults to None, i.e., the default tolerance of the method.
+
+        Raises:
+            ValueError: If a tolerance is given for a method that is not native.
+        """
+        method = method.lower()
+        if tolerance is not None and method not in NATIVE_METHODS:
+            raise ValueError(f"The bonding method {method} does not support a tolerance")
+        if (self._cnn_method, self._cnn_tolerance) == (method, tolerance):
             return
-        self._cnn_method = method.lower()
+        self._cnn_method = method
+        self._cnn_tolerance = tolerance
+        # results derived from the previous graph
+        self._graph = None
+        self._nx_graph = None
+        self._adjacency = None
+        self._coordination_numbers = None
+        self._components = None
+        self._connected_sites = {}
+        self._checks.discard(_GRAPH_CHECKS)
+
+    def _build_artifact(self, artifact: str) -> None:
+        if artifact == "graph":
+            _ = self.graph
+        elif artifact == "symmetry":
+            _ = self.get_symmetry_dataset()
+        elif artifact == "distance_matrix":
+            _ = self.distance_matrix
+        elif artifact in _TOOL_CHECKS:
+            _ = self.checks[_TOOL_CHECKS[artifact]].is_ok
+
+    def _build_artifacts_with_tools(self, artifacts: List[str], tools: List[str]) -> None:
+        # the tools mostly wait on a subprocess or native code, hence they overlap
+        # with the other artifacts. The checks are created in this thread,
+        # the background threads only run them.
+        tool_checks = [self.checks[_TOOL_CHECKS[tool]] for tool in tools]
+        with ThreadPoolExecutor(max_workers=len(tool_checks)) as pool:
+            futures = [pool.submit(getattr, check, "is_ok") for check in tool_checks]
+            for artifact in artifacts:
+                if artifact not in tools:
+                    self._build_artifact(artifact)
+            for future in futures:
+                future.result()
 
     def get_mof_descriptors(self, descriptors=None) -> OrderedDict:
         """Run sanity checks and get a dictionary with the result.
 
+        Only the artifacts (e.g., the structure graph or the symmetrized structure)
+        that the descriptors depend on are computed,
+        see :py:data:`~mofchecker.descriptors.DESCRIPTOR_DEPENDENCIES`.
+        With `background_tools`, zeo++ and EqEq are started first and run
+        while the other artifacts are built.
+
         Args:
             descriptors (List): If provided, compute only the passed descriptors
 
@@ -620,7 +1073,63 @@ class MOFChecker:
         if descriptors is None:
             descriptors = DESCRIPTORS
 
+        # build every artifact that is needed exactly once, and nothing else
+        artifacts = plan_artifacts(descriptors)
+        tools = [artifact for artifact in artifacts if artifact in _TOOL_CHECKS]
+        if self._background_tools and tools:
+            self._build_artifacts_with_tools(artifacts, tools)
+        else:
+            for artifact in artifacts:
+                self._build_artifact(artifact)
+
         result_dict = OrderedDict(
             ((descriptor, getattr(self, descriptor)) for descriptor in descriptors)
         )
         return result_dict
+
+    def passes(
+        self, checks: Optional[Iterable[str]] = None, fail_fast: bool = True
+    ) -> Tuple[bool, List[str]]:
+        """Check whether the structure passes the checks.
+
+        The checks run in the order of increasing cost (see `SCREENING_CHECKS`),
+        such that, e.g., the structure graph is not computed
+        for a structure with overlapping atoms.
+        Checks that cannot be performed (e.g., the porosity check without zeo++)
+        do not fail.
+
+        Args:
+            checks (Iterable[str], optional): Names of the checks, see :py:attr:`checks`.
+                Defaults to None, i.e., `SCREENING_CHECKS`.
+            fail_fast (bool): Stop at the first failed check. Defaults to True.
+
+        Raises:
+            ValueError: If a check is unknown.
+
+        Returns:
+            Tuple[bool, List[str]]: True if all checks passed, and the names of the
+                failed checks (at most one with `fail_fast`).
+        """
+        if checks is None:
+            checks = SCREENING_CHECKS
+        else:
+            checks = list(checks)
+            unknown = set(checks) - set(self.checks)
+            if unknown:
+                raise ValueError(f"Unknown checks {sorted(unknown)}")
+            # checks without cost estimate (e.g., no_oms) run last
+            checks = sorted(
+                checks,
+                key=lambda name: SCREENING_CHECKS.index(name)
+                if name in SCREENING_CHECKS
+                else len(SCREENING_CHECKS),
+            )
+
+        failed = []
+        for name in checks:
+            is_ok = self.checks[name].is_ok
+            if is_ok is not None and not is_ok:
+                failed.append(name)
+                if fail_fast:
+                    break
+        return not failed, failed
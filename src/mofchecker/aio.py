@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Run the checks from asyncio code without blocking the event loop."""
+import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from . import DESCRIPTOR_DEPENDENCIES, DESCRIPTORS
+from .batch.records import InputType, format_error, make_record, run_check
+from .checks.charge_check import ahas_reasonable_charges
+from .checks.zeopp import acheck_if_porous
+
+__all__ = ["acheck", "acheck_many"]
+
+# descriptors that are computed with external programs
+EXTERNAL_DESCRIPTORS = tuple(
+    descriptor
+    for descriptor, artifacts in DESCRIPTOR_DEPENDENCIES.items()
+    if {"zeopp", "eqeq"} & set(artifacts)
+)
+
+
+async def _run_external(cif: str, descriptors: List[str]) -> dict:
+    """Compute the descriptors that need zeo++ or EqEq concurrently."""
+    with TemporaryDirectory() as tempdir:
+        structure_path = os.path.join(tempdir, "structure.cif")
+        with open(structure_path, "w") as handle:
+            handle.write(cif)
+
+        coroutines = {}
+        if "is_porous" in descriptors:
+            coroutines["is_porous"] = acheck_if_porous(structure_path)
+        if "has_high_charges" in descriptors:
+            coroutines["has_high_charges"] = ahas_reasonable_charges(structure_path)
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines.values()]
+        try:
+            values = await asyncio.gather(*tasks)
+        except BaseException:
+            # also stop the other program if one fails or we are cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    results = dict(zip(coroutines, values))
+    if "has_high_charges" in results:
+        # same convention as MOFChecker.has_high_charges
+        results["has_high_charges"] = not results["has_high_charges"]
+    return results
+
+
+async def acheck(
+    item: InputType,
+    descriptors: Optional[List[str]] = None,
+    index: int = 0,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> OrderedDict:
+    """Run the checks on one structure without blocking the event loop.
+
+    The structure is read and checked in `executor`.
+    zeo++ (`is_porous`) and EqEq (`has_high_charges`) then run concurrently
+    as asyncio subprocesses. If the task is cancelled, these subprocesses
+    are killed. Work that was already started in the executor
+    runs to completion, but its result is discarded.
+
+    Args:
+        item (Union[PathType, StructureIStructureType]): Path to a CIF file
+            or a pymatgen structure.
+        descriptors (List[str], optional): Descriptors to compute.
+            Defaults to None, i.e., all descriptors.
+        index (int): Index of the structure in the input. Defaults to 0.
+        executor (Executor, optional): Executor in which the structure is checked.
+            Defaults to None, i.e., the default executor of the event loop.
+        **kwargs: Passed to the :py:class:`~mofchecker.MOFChecker` constructor.
+
+    Returns:
+        OrderedDict: Result row, see :py:func:`~mofchecker.batch.check_one`.
+    """
+    descriptors = list(DESCRIPTORS if descriptors is None else descriptors)
+    external = [descriptor for descriptor in descriptors if descriptor in EXTERNAL_DESCRIPTORS]
+    internal = [descriptor for descriptor in descriptors if descriptor not in external]
+
+    loop = asyncio.get_running_loop()
+    try:
+        record, cif = await loop.run_in_executor(
+            executor, run_check, item, internal, index, kwargs, bool(external)
+        )
+    except Exception as exc:  # pylint:disable=broad-except
+        # e.g., a broken process pool
+        return make_record(index, item, "error", error=format_error(exc))
+
+    if record["status"] != "ok" or not external:
+        return record
+
+    try:
+        external_results = await _run_external(cif, external)
+    except Exception as exc:  # pylint:disable=broad-except
+        return make_record(index, item, "error", error=format_error(exc))
+
+    results = record["descriptors"]
+    results.update(external_results)
+    record["descriptors"] = OrderedDict(
+        (descriptor, results[descriptor]) for descriptor in descriptors
+    )
+    return record
+
+
+async def _aenumerate(
+    inputs: Union[Iterable[InputType], AsyncIterable[InputType]]
+) -> AsyncIterator[Tuple[int, InputType]]:
+    if hasattr(inputs, "__aiter__"):
+        index = 0
+        async for item in inputs:
+            yield index, item
+            index += 1
+    else:
+        for index, item in enumerate(inputs):
+            yield index, item
+
+
+async def acheck_many(
+    inputs: Union[Iterable[InputType], AsyncIterable[InputType]],
+    descriptors: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> AsyncIterator[OrderedDict]:
+    """Check many structures and yield the result rows as they complete.
+
+    At most `2 * workers` structures are in flight at any time,
+    hence `inputs` can be a (lazy) iterable or async iterable.
+    When the iteration stops early (e.g., the consuming task is cancelled),
+    the pending checks are cancelled.
+
+    Example:
+        >>> async for result in acheck_many(paths, workers=4):
+        ...     print(result["input"], result["status"])
+
+    Args:
+        inputs (Union[Iterable, AsyncIterable]): Paths to CIF files or pymatgen structures.
+        descriptors (List[str], optional): Descriptors to compute.
+            Defaults to None, i.e., all descriptors.
+        workers (int, optional): Number of concurrent checks (and worker processes
+            if no executor is given). Defaults to None, i.e., the number of CPUs.
+        executor (Executor, optional): Executor in which the structures are checked.
+            Defaults to None, i.e., a process pool with `workers` processes
+            that is shut down at the end.
+        **kwargs: Passed to the :py:class:`~mofchecker.MOFChecker` constructor.
+
+    Yields:
+        OrderedDict: One result row per structure,
+            see :py:func:`~mofchecker.batch.check_one`.
+    """
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_pending = 2 * workers
+    tasks = _aenumerate(inputs)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    index, item = await tasks.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(
+                    asyncio.ensure_future(acheck(item, descriptors, index, executor, **kwargs))
+                )
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await tasks.aclose()
+        if own_executor:
+            executor.shutdown(wait=False)
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""Run the checks on many structures in parallel."""
+import functools
+import itertools
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .checkpoint import Checkpoint
+from .executors import BACKENDS, SerialExecutor, make_executor, pack
+from .inputs import iter_input_paths
+from .pool import SupervisedPool, parse_memory
+from .records import InputType, format_error, make_record, run_check
+from .scheduling import estimate_cost, get_window, longest_first
+from .sharding import ShardType, in_shard, merge_results, parse_shard
+from ..descriptors import DESCRIPTORS
+
+__all__ = [
+    "check_many",
+    "check_one",
+    "estimate_cost",
+    "iter_input_paths",
+    "merge_results",
+    "parse_shard",
+    "BACKENDS",
+    "Checkpoint",
+    "SerialExecutor",
+]
+
+
+def check_one(
+    item: InputType, descriptors: Optional[List[str]] = None, index: int = 0, **kwargs
+) -> OrderedDict:
+    """Run the checks on one structure and return a result row.
+
+    Exceptions raised while reading or checking the structure
+    (e.g., :py:class:`~mofchecker.errors.NoMetal` or parsing errors)
+    are recorded in the result row instead of being raised.
+
+    Args:
+        item (Union[PathType, StructureIStructureType]): Path to a CIF file
+            or a pymatgen structure.
+        descriptors (List[str], optional): Descriptors to compute.
+            Defaults to None, i.e., all descriptors.
+        index (int): Index of the structure in the input. Defaults to 0.
+        **kwargs: Passed to the :py:class:`~mofchecker.MOFChecker` constructor.
+
+    Returns:
+        OrderedDict: Result row with the keys `index`, `input`, `status`
+            (`ok`, `rejected`, `error`, `timeout` or `oom`), `error` and `descriptors`.
+            Structures that fail the pre-screen (with `prescreen=True`) get the status
+            `rejected` and the failed checks are listed in `error`.
+    """
+    record, _ = run_check(item, descriptors, index, kwargs)
+    return record
+
+
+def _check_chunk(
+    chunk: List[Tuple[int, InputType]], descriptors: Optional[List[str]], kwargs: dict
+) -> List[OrderedDict]:
+    return [check_one(item, descriptors, index, **kwargs) for index, item in chunk]
+
+
+def _check_task(task: Tuple[int, InputType], descriptors: Optional[List[str]], kwargs: dict):
+    index, item = task
+    return check_one(item, descriptors, index, **kwargs)
+
+
+def _check_supervised(
+    tasks: Iterable[Tuple[int, InputType]],
+    descriptors: Optional[List[str]],
+    workers: int,
+    timeout: Optional[float],
+    max_memory: Union[int, str, None],
+    max_tasks_per_worker: Optional[int],
+    kwargs: dict,
+) -> Iterator[OrderedDict]:
+    pool = SupervisedPool(
+        functools.partial(_check_task, descriptors=descriptors, kwargs=kwargs),
+        workers=workers,
+        timeout=timeout,
+        max_memory=max_memory,
+        max_tasks_per_worker=max_tasks_per_worker,
+    )
+    packed_tasks = ((index, pack(item)) for index, item in tasks)
+    for (index, item), status, payload in pool.imap_unordered(packed_tasks):
+        if status == "ok":
+            yield payload
+        else:
+            yield make_record(index, item, status, error=payload)
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _check_executor(
+    tasks: Iterable[Tuple[int, InputType]],
+    descriptors: Optional[List[str]],
+    executor: Executor,
+    max_pending: int,
+    chunksize: int,
+    kwargs: dict,
+) -> Iterator[OrderedDict]:
+    # structures are only packed if they are sent to other processes
+    in_process = isinstance(executor, (SerialExecutor, ThreadPoolExecutor))
+    chunks = _chunked(tasks, max(1, chunksize))
+    pending = {}
+
+    def failed(chunk, exc):
+        return [make_record(index, item, "error", error=format_error(exc)) for index, item in chunk]
+
+    def submit(chunk):
+        if not in_process:
+            chunk = [(index, pack(item)) for index, item in chunk]
+        try:
+            future = executor.submit(_check_chunk, chunk, descriptors, kwargs)
+        except Exception as exc:  # pylint:disable=broad-except
+            # e.g., BrokenProcessPool, the executor does not accept any further tasks
+            yield from failed(chunk, exc)
+            for rest in chunks:
+                yield from failed(rest, exc)
+        else:
+            pending[future] = chunk
+
+    for chunk in itertools.islice(chunks, max_pending):
+        yield from submit(chunk)
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            chunk = pending.pop(future)
+            try:
+                records = future.result()
+            except Exception as exc:  # pylint:disable=broad-except
+                # e.g., the structures could not be sent to the worker
+                records = failed(chunk, exc)
+            yield from records
+            for new_chunk in itertools.islice(chunks, 1):
+                yield from submit(new_chunk)
+
+
+def check_many(
+    inputs: Iterable[InputType],
+    descriptors: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    timeout: Optional[float] = None,
+    max_memory: Union[int, str, None] = None,
+    max_tasks_per_worker: Optional[int] = None,
+    checkpoint: Union[str, Checkpoint, None] = None,
+    shard: Union[str, ShardType, None] = None,
+    schedule: str = "size",
+    executor: Union[str, Executor, None] = None,
+    **kwargs,
+) -> Iterator[OrderedDict]:
+    """Check many structures in parallel.
+
+    Results are yielded as soon as they are available, i.e.,
+    not necessarily in input order. Use the `index` key
+    of the result rows to restore the input order.
+    Only a bounded number of tasks is in flight at any time, hence
+    `inputs` can be a (lazy) generator.
+
+    If any of `timeout`, `max_memory` or `max_tasks_per_worker` is set,
+    the structures are sent one by one to a
+    :py:class:`~mofchecker.batch.pool.SupervisedPool`.
+    Workers that exceed a limit are killed and replaced, and the structure
+    gets the status `timeout` or `oom`.
+    With `prescreen=True` (passed to the :py:class:`~mofchecker.MOFChecker` constructor),
+    structures that fail the graph-free checks get the status `rejected`
+    before the structure graph is built.
+
+    Without limits, the structures are checked with `executor`, which can be
+    the name of a built-in backend (`serial`, `thread` or `process`)
+    or any :py:class:`concurrent.futures.Executor`, e.g., one that distributes
+    the work over a cluster. By default, the structures are checked in a process
+    pool, or in the current process if `workers` is one.
+    pymatgen structures are sent to other processes as compact arrays
+    (see :py:func:`~mofchecker.batch.executors.pack`) to keep the cost of pickling low.
+
+    With a `checkpoint`, every finished input file is recorded in a manifest
+    and inputs that are already recorded for the same descriptors, options
+    and mofchecker version are skipped, i.e., an interrupted run can be resumed.
+    Only inputs with the status `ok` or `rejected` are recorded, inputs with
+    an `error`, `timeout` or `oom` are checked again.
+
+    With `shard=(i, N)` (or `"i/N"`) only the inputs in the i-th of N shards
+    are checked. The assignment is based on a hash of the path and does not
+    change when files are added, see :py:func:`~mofchecker.batch.sharding.shard_of`.
+    The `index` in the result rows always refers to the position in `inputs`.
+
+    With `schedule="size"` (the default), the structures are dispatched to the
+    workers largest first, based on the number of atoms estimated from the CIF
+    text (see :py:func:`~mofchecker.batch.scheduling.longest_first`).
+    The structures are sorted within a window of four inputs per worker
+    (see :py:func:`~mofchecker.batch.scheduling.get_window`).
+    This avoids that a single large structure keeps one worker busy
+    at the end of the run while all others are idle.
+    With `schedule="input"`, the structures are dispatched in input order.
+
+    The arguments are validated when `check_many` is called,
+    the structures are only checked while the results are iterated.
+
+    Args:
+        inputs (Iterable[Union[PathType, StructureIStructureType]]): Paths to CIF files
+            or pymatgen structures.
+        descriptors (List[str], optional): Descriptors to compute.
+            Defaults to None, i.e., all descriptors.
+        workers (int, optional): Number of worker processes.
+            Defaults to None, i.e., the number of CPUs.
+        chunksize (int): Number of structures sent to a worker at once.
+            Ignored if limits are set. Defaults to 1.
+        timeout (float, optional): Wall-clock limit per structure in seconds.
+            Defaults to None, i.e., no limit.
+        max_memory (Union[int, str], optional): Memory limit per worker in bytes
+            or as string like `4G`. Defaults to None, i.e., no limit.
+        max_tasks_per_worker (int, optional): Replace workers after this number
+            of structures. Defaults to None, i.e., never.
+        checkpoint (Union[str, Checkpoint], optional): Path to the manifest
+            (or a :py:class:`~mofchecker.batch.checkpoint.Checkpoint`) used to
+            skip finished inputs. Defaults to None, i.e., no checkpointing.
+        shard (Union[str, Tuple[int, int]], optional): Check only the inputs of shard
+            `i` of `N` (counted from zero). Defaults to None, i.e., all inputs.
+        schedule (str): Dispatch order, `size` (largest structures first) or `input`.
+            Only used with more than one worker. Defaults to "size".
+        executor (Union[str, Executor], optional): `serial`, `thread`, `process`
+            or an executor instance, which is not shut down at the end.
+            Must be None or `process` if limits are set.
+            Defaults to None, i.e., `serial` for one worker and `process` otherwise.
+        **kwargs: Passed to the :py:class:`~mofchecker.MOFChecker` constructor.
+
+    Raises:
+        ValueError: If a descriptor, the schedule, the shard, the memory limit
+            or the backend is invalid, or if limits are set for another backend
+            than `process`.
+
+    Returns:
+        Iterator[OrderedDict]: One result row per structure,
+            see :py:func:`~mofchecker.batch.check_one`.
+    """
+    unknown = [name for name in descriptors or [] if name not in DESCRIPTORS]
+    if unknown:
+        raise ValueError(f"Unknown descriptors {unknown}")
+    if schedule not in ("size", "input"):
+        raise ValueError(f"Unknown schedule {schedule}, use size or input")
+    if isinstance(executor, str) and executor not in BACKENDS:
+        raise ValueError(f"Unknown backend {executor}, use one of {', '.join(BACKENDS)}")
+    supervised = any(limit is not None for limit in (timeout, max_memory, max_tasks_per_worker))
+    if supervised and executor not in (None, "process"):
+        raise ValueError("Time and memory limits are only supported for the process backend")
+    return _check_many(
+        inputs,
+        descriptors,
+        workers or os.cpu_count() or 1,
+        chunksize,
+        (timeout, parse_memory(max_memory), max_tasks_per_worker) if supervised else None,
+        checkpoint,
+        parse_shard(shard) if shard is not None else None,
+        schedule,
+        executor,
+        kwargs,
+    )
+
+
+def _check_many(  # pylint:disable=too-many-arguments
+    inputs: Iterable[InputType],
+    descriptors: Optional[List[str]],
+    workers: int,
+    chunksize: int,
+    limits: Optional[Tuple[Optional[float], Optional[int], Optional[int]]],
+    checkpoint: Union[str, Checkpoint, None],
+    shard: Optional[ShardType],
+    schedule: str,
+    executor: Union[str, Executor, None],
+    kwargs: dict,
+) -> Iterator[OrderedDict]:
+    tasks = enumerate(inputs)
+    if shard is not None:
+        tasks = in_shard(tasks, shard)
+
+    close_checkpoint = False
+    if isinstance(checkpoint, (str, os.PathLike)):
+        checkpoint = Checkpoint(os.fspath(checkpoint), descriptors, kwargs)
+        close_checkpoint = True
+    if checkpoint is not None:
+        tasks = checkpoint.filter(tasks)
+    if schedule == "size" and workers > 1:
+        tasks = longest_first(tasks, get_window(workers))
+
+    own_executor = False
+    if limits is not None:
+        results = _check_supervised(tasks, descriptors, workers, *limits, kwargs)
+    else:
+        if executor is None:
+            executor = "serial" if workers == 1 else "process"
+        if isinstance(executor, str):
+            executor = make_executor(executor, workers)
+            own_executor = True
+        max_pending = 1 if isinstance(executor, SerialExecutor) else 2 * workers
+        results = _check_executor(tasks, descriptors, executor, max_pending, chunksize, kwargs)
+
+    try:
+        for record in results:
+            if checkpoint is not None:
+                checkpoint.add(record)
+            yield record
+    finally:
+        results.close()
+        if own_executor:
+            executor.shutdown()
+        if close_checkpoint:
+            checkpoint.close()
+        elif checkpoint is not None:
+            checkpoint.commit()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Manifest of finished inputs that allows to resume batch runs."""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ..version import get_version
+
+__all__ = ["FINISHED_STATUSES", "Checkpoint", "file_digest"]
+
+# statuses of result rows that are final, inputs with other statuses are retried
+FINISHED_STATUSES = ("ok", "rejected")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS finished (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    descriptors TEXT NOT NULL,
+    options TEXT NOT NULL,
+    version TEXT NOT NULL,
+    status TEXT NOT NULL,
+    record TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS finished_path ON finished (path);
+"""
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 digest of the file content."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class Checkpoint:
+    """Append-only manifest of the inputs that were already checked.
+
+    Every finished input is recorded with its path, size, modification time
+    and content digest, together with the descriptors, the options of the run
+    and the mofchecker version.
+    An input counts as finished if there is a row for the same path, descriptors,
+    options and version, and the file did not change since then.
+    The modification time is used as fast path, the digest is only computed
+    if the modification time changed (e.g., after copying the files).
+
+    Rows are only ever inserted and are committed in batches,
+    such that writing the manifest is cheap also for many fast checks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        descriptors: Optional[List[str]] = None,
+        options: Optional[dict] = None,
+        version: Optional[str] = None,
+        commit_every: int = 100,
+        commit_interval: float = 5.0,
+    ):
+        """Open (or create) a checkpoint manifest.
+
+        Args:
+            path (str): Path to the SQLite database.
+            descriptors (List[str], optional): Descriptors of the run.
+                Defaults to None, i.e., all descriptors.
+            options (dict, optional): Other options of the run that change the results,
+                e.g., the keyword arguments for the MOFChecker constructor. Defaults to None.
+            version (str, optional): mofchecker version.
+                Defaults to None, i.e., the installed version.
+            commit_every (int): Commit after this number of rows. Defaults to 100.
+            commit_interval (float): Commit if the last commit is older than
+                this number of seconds. Defaults to 5.0.
+        """
+        self.path = path
+        self.descriptors = ",".join(sorted(descriptors)) if descriptors is not None else "*"
+        self.options = json.dumps(options or {}, sort_keys=True, default=str)
+        self.version = version or get_version()
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Commit and close the manifest."""
+        self.close()
+
+    def _rows(self, path: str) -> List[Tuple[int, int, str]]:
+        return self._connection.execute(
+            "SELECT size, mtime_ns, digest FROM finished "
+            "WHERE path = ? AND descriptors = ? AND options = ? AND version = ?",
+            (path, self.descriptors, self.options, self.version),
+        ).fetchall()
+
+    def is_finished(self, path: str) -> bool:
+        """Return True if the file was already checked with the same settings."""
+        path = os.path.abspath(path)
+        rows = self._rows(path)
+        if not rows:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if any(size == stat.st_size and mtime == stat.st_mtime_ns for size, mtime, _ in rows):
+            return True
+        candidates = {digest for size, _, digest in rows if size == stat.st_size}
+        return bool(candidates) and file_digest(path) in candidates
+
+    def filter(self, tasks: Iterable[Tuple[int, object]]) -> Iterator[Tuple[int, object]]:
+        """Drop the (index, input) pairs for which the input is already finished.
+
+        Inputs that are not paths (e.g., structure objects) are never dropped.
+        """
+        for index, item in tasks:
+            if isinstance(item, (str, os.PathLike)) and self.is_finished(os.fspath(item)):
+                continue
+            yield index, item
+
+    def add(self, record: dict) -> None:
+        """Record a result row of a finished input.
+
+        Only rows with the status `ok` or `rejected` are recorded.
+        Inputs that failed (`error`, `timeout` or `oom`, e.g., because of a
+        transient resource limit) are checked again when the run is resumed.
+        Rows without a path (e.g., for structure objects)
+        or for files that disappeared are ignored as well.
+        """
+        if record.get("input") is None or record.get("status") not in FINISHED_STATUSES:
+            return
+        path = os.path.abspath(record["input"])
+        try:
+            stat = os.stat(path)
+            digest = file_digest(path)
+        except OSError:
+            return
+        self._connection.execute(
+            "INSERT INTO finished VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                stat.st_size,
+                stat.st_mtime_ns,
+                digest,
+                self.descriptors,
+                self.options,
+                self.version,
+                record["status"],
+                json.dumps(record, default=str),
+                time.time(),
+            ),
+        )
+        self._uncommitted += 1
+        if (
+            self._uncommitted >= self.commit_every
+            or time.monotonic() - self._last_commit > self.commit_interval
+        ):
+            self.commit()
+
+    def commit(self) -> None:
+        """Write the pending rows to disk."""
+        self._connection.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        """Commit and close the manifest."""
+        self.commit()
+        self._connection.close()
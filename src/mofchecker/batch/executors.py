@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Executor backends for batch checking."""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from pymatgen.core import IStructure, Lattice, Structure
+
+__all__ = ["BACKENDS", "SerialExecutor", "PackedStructure", "make_executor", "pack"]
+
+BACKENDS = ("serial", "thread", "process")
+
+
+class SerialExecutor(Executor):
+    """Executor that runs every task immediately in the calling thread.
+
+    Useful for debugging, e.g., to get tracebacks and to use breakpoints.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:  # pylint:disable=arguments-differ
+        """Run `fn(*args, **kwargs)` and return a completed future."""
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:  # pylint:disable=broad-except
+            future.set_exception(exc)
+        return future
+
+
+def make_executor(backend: str, workers: Optional[int] = None) -> Executor:
+    """Create an executor for one of the built-in backends.
+
+    Args:
+        backend (str): `serial`, `thread` or `process`.
+        workers (int, optional): Number of threads or processes.
+            Defaults to None, i.e., the default of the executor.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Returns:
+        Executor: The executor.
+    """
+    if backend == "serial":
+        return SerialExecutor()
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown backend {backend}, use one of {', '.join(BACKENDS)}")
+
+
+class PackedStructure(NamedTuple):
+    """Compact representation of an ordered structure that is cheap to pickle."""
+
+    lattice: np.ndarray
+    species: List[str]
+    frac_coords: np.ndarray
+
+    def to_structure(self) -> Structure:
+        """Rebuild the pymatgen structure."""
+        return Structure(Lattice(self.lattice), self.species, self.frac_coords)
+
+
+def pack(item):
+    """Replace ordered pymatgen structures by a compact representation.
+
+    Pickling a pymatgen structure (with all its site objects) is
+    much more expensive than pickling three arrays, which matters
+    if many small structures are sent to worker processes.
+    Paths and disordered structures are returned unchanged.
+
+    Args:
+        item (Union[PathType, StructureIStructureType]): Input of a batch run.
+
+    Returns:
+        Union[PathType, StructureIStructureType, PackedStructure]: Input that is
+            cheap to send to another process.
+    """
+    if isinstance(item, (Structure, IStructure)) and item.is_ordered:
+        return PackedStructure(
+            item.lattice.matrix, [site.species_string for site in item], item.frac_coords
+        )
+    return item
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Lazily enumerate the input files for batch runs."""
+import glob
+import os
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+__all__ = ["iter_input_paths"]
+
+STRUCTURE_SUFFIXES = (".cif",)
+
+
+def _has_suffix(path: str, suffixes: Tuple[str, ...]) -> bool:
+    return path.lower().endswith(suffixes)
+
+
+def _walk(directory: str, suffixes: Tuple[str, ...]) -> Iterator[str]:
+    """Recursively yield files in a directory without listing it up front."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif _has_suffix(entry.name, suffixes):
+                        yield entry.path
+        except PermissionError:
+            continue
+
+
+def _expand(pattern: str, suffixes: Tuple[str, ...]) -> Iterator[str]:
+    if os.path.isdir(pattern):
+        yield from _walk(pattern, suffixes)
+    elif glob.has_magic(pattern):
+        for path in glob.iglob(pattern, recursive=True):
+            if os.path.isdir(path):
+                yield from _walk(path, suffixes)
+            else:
+                yield path
+    else:
+        # non-existing files are passed on such that they
+        # show up as failed structure in the output
+        yield pattern
+
+
+def _iter_lines(handle: IO) -> Iterator[str]:
+    for line in handle:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def iter_input_paths(
+    patterns: Iterable[str] = (),
+    from_file: Optional[IO] = None,
+    suffixes: Tuple[str, ...] = STRUCTURE_SUFFIXES,
+) -> Iterator[str]:
+    """Lazily enumerate structure files.
+
+    Directories are searched recursively for files with one of the `suffixes`,
+    glob patterns (including `**`) are expanded, and other paths are
+    passed on unchanged.
+    Nothing is listed up front, i.e., the first path is available
+    immediately, even for directories with millions of files.
+
+    Args:
+        patterns (Iterable[str]): Paths, directories or glob patterns.
+        from_file (IO, optional): Open file with one path, directory or glob pattern per line.
+            Empty lines and lines starting with `#` are ignored. Defaults to None.
+        suffixes (Tuple[str, ...]): File suffixes to consider when searching directories.
+            Defaults to (".cif",).
+
+    Yields:
+        str: Path to a structure file.
+    """
+    for pattern in patterns:
+        yield from _expand(pattern, suffixes)
+    if from_file is not None:
+        for pattern in _iter_lines(from_file):
+            yield from _expand(pattern, suffixes)
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""Process pool that enforces a time and memory limit per task."""
+import multiprocessing
+import os
+import re
+import signal
+import time
+import warnings
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+__all__ = ["SupervisedPool", "parse_memory"]
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+_SENTINEL = object()
+
+
+def parse_memory(size: Union[int, str, None]) -> Optional[int]:
+    """Convert a memory size like `512M` or `4G` to bytes.
+
+    Args:
+        size (Union[int, str, None]): Size in bytes or with a K, M, G or T suffix.
+
+    Raises:
+        ValueError: If the size cannot be parsed.
+
+    Returns:
+        Optional[int]: Size in bytes, None if size is None.
+    """
+    if size is None or isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", size.upper())
+    if match is None:
+        raise ValueError(f"Cannot parse memory size {size}")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def _limit_memory(max_memory: int) -> None:
+    try:
+        import resource  # pylint:disable=import-outside-toplevel
+    except ImportError:
+        warnings.warn("Memory limits are only supported on POSIX systems.")
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+
+def _worker_loop(conn, func: Callable, max_memory: Optional[int]) -> None:
+    if hasattr(os, "setpgrp"):
+        # own process group such that external tools (e.g., zeo++)
+        # are killed together with the worker
+        os.setpgrp()
+    if max_memory is not None:
+        _limit_memory(max_memory)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        try:
+            message = ("ok", func(task))
+        except MemoryError as exc:
+            message = ("oom", f"MemoryError: {exc}")
+        except Exception as exc:  # pylint:disable=broad-except
+            message = ("error", f"{type(exc).__name__}: {exc}")
+        conn.send(message)
+    conn.close()
+
+
+class _Worker:
+    """One worker process and the task it is currently working on."""
+
+    def __init__(self, context, func: Callable, max_memory: Optional[int]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_loop, args=(child_conn, func, max_memory), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.task = _SENTINEL
+        self.started = None
+        self.completed_tasks = 0
+
+    @property
+    def busy(self) -> bool:
+        return self.task is not _SENTINEL
+
+    def submit(self, task) -> None:
+        self.task = task
+        self.started = time.monotonic()
+        self.conn.send(task)
+
+    def release(self):
+        task = self.task
+        self.task = _SENTINEL
+        self.started = None
+        return task
+
+    def kill(self) -> None:
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                # the worker did not yet start its own process group
+                pass
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        if self.busy or not self.process.is_alive():
+            self.kill()
+            return
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class SupervisedPool:
+    """Process pool that supervises every task.
+
+    Workers that exceed the wall-clock `timeout` for a task are killed
+    (together with their child processes) and replaced.
+    The address space of the workers is limited to `max_memory` bytes,
+    such that allocations beyond this limit fail with a MemoryError.
+    Workers that die are replaced as well.
+    Workers are recycled after `max_tasks_per_worker` tasks to bound
+    the memory growth of long-running processes.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_memory: Union[int, str, None] = None,
+        max_tasks_per_worker: Optional[int] = None,
+    ):
+        """Create a supervised pool.
+
+        Args:
+            func (Callable): Picklable function that is called with one task.
+            workers (int, optional): Number of worker processes.
+                Defaults to None, i.e., the number of CPUs.
+            timeout (float, optional): Wall-clock limit per task in seconds.
+                Defaults to None, i.e., no limit.
+            max_memory (Union[int, str], optional): Memory limit per worker
+                in bytes or as string like `4G`. Defaults to None, i.e., no limit.
+            max_tasks_per_worker (int, optional): Number of tasks after which a
+                worker is replaced by a fresh one. Defaults to None, i.e., never.
+        """
+        self.func = func
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_memory = parse_memory(max_memory)
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._context = multiprocessing.get_context()
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.func, self.max_memory)
+
+    def _died_status(self, worker: _Worker) -> Tuple[str, str]:
+        # the pipe can close before the process has exited and its exit code is set
+        worker.process.join(timeout=5)
+        exitcode = worker.process.exitcode
+        # the OOM killer sends SIGKILL, other deaths (e.g., a segfault) are errors
+        if exitcode == -signal.SIGKILL:
+            return "oom", f"Worker died with exit code {exitcode}, likely out of memory"
+        return "error", f"Worker died with exit code {exitcode}"
+
+    def imap_unordered(self, tasks: Iterable) -> Iterator[Tuple[Any, str, Any]]:
+        """Run `func` on all tasks and yield the results as they complete.
+
+        Tasks are taken lazily from the iterable.
+
+        Args:
+            tasks (Iterable): Arguments for `func`.
+
+        Yields:
+            Tuple[Any, str, Any]: The task, the status (`ok`, `error`, `timeout` or `oom`)
+                and the return value of `func` or an error message.
+        """
+        tasks = iter(tasks)
+        workers = [self._spawn() for _ in range(self.workers)]
+        exhausted = False
+        try:
+            while True:
+                for index, worker in enumerate(workers):
+                    if exhausted or worker.busy:
+                        continue
+                    task = next(tasks, _SENTINEL)
+                    if task is _SENTINEL:
+                        exhausted = True
+                        break
+                    try:
+                        worker.submit(task)
+                    except (BrokenPipeError, OSError):
+                        worker.kill()
+                        workers[index] = worker = self._spawn()
+                        worker.submit(task)
+
+                busy = [worker for worker in workers if worker.busy]
+                if not busy:
+                    return
+
+                wait_time = None
+                if self.timeout is not None:
+                    deadline = min(worker.started for worker in busy) + self.timeout
+                    wait_time = max(0.0, deadline - time.monotonic())
+                wait(
+                    [worker.conn for worker in busy] + [worker.process.sentinel for worker in busy],
+                    wait_time,
+                )
+
+                for index, worker in enumerate(workers):
+                    if not worker.busy:
+                        continue
+                    replace = False
+                    if worker.conn.poll():
+                        try:
+                            status, payload = worker.conn.recv()
+                        except (EOFError, OSError):
+                            status, payload = self._died_status(worker)
+                            replace = True
+                        worker.completed_tasks += 1
+                        yield worker.release(), status, payload
+                        if (
+                            self.max_tasks_per_worker is not None
+                            and worker.completed_tasks >= self.max_tasks_per_worker
+                        ):
+                            replace = True
+                    elif not worker.process.is_alive():
+                        yield (worker.release(), *self._died_status(worker))
+                        replace = True
+                    elif (
+                        self.timeout is not None
+                        and time.monotonic() - worker.started > self.timeout
+                    ):
+                        worker.kill()
+                        yield worker.release(), "timeout", f"Exceeded timeout of {self.timeout} s"
+                        workers[index] = self._spawn()
+                        continue
+                    if replace:
+                        worker.stop()
+                        workers[index] = self._spawn()
+        finally:
+            for worker in workers:
+                worker.stop()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Result rows of the checks of one structure.
+
+These helpers are shared by the batch runner, the asyncio interface
+(:py:mod:`mofchecker.aio`) and the HTTP service (:py:mod:`mofchecker.server`),
+such that all of them report results and failures in the same form.
+"""
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+
+from .executors import PackedStructure
+from ..errors import PrescreenFailed
+from ..types import PathType, StructureIStructureType
+
+__all__ = ["InputType", "describe_input", "format_error", "make_record", "run_check"]
+
+InputType = Union[PathType, StructureIStructureType]
+
+
+def describe_input(item: InputType) -> Optional[str]:
+    """Return a string that identifies the input in a result row."""
+    if isinstance(item, (str, os.PathLike)):
+        return os.fspath(item)
+    return None
+
+
+def format_error(exc: BaseException) -> str:
+    """Return the error message of a result row."""
+    return f"{type(exc).__name__}: {exc}"
+
+
+def make_record(
+    index: int,
+    item: InputType,
+    status: str,
+    descriptors: Optional[OrderedDict] = None,
+    error: Optional[str] = None,
+) -> OrderedDict:
+    """Create a result row.
+
+    Args:
+        index (int): Index of the structure in the input.
+        item (Union[PathType, StructureIStructureType]): The input, only paths are reported.
+        status (str): `ok`, `rejected`, `error`, `timeout` or `oom`.
+        descriptors (OrderedDict, optional): The descriptors. Defaults to None.
+        error (str, optional): The error message. Defaults to None.
+
+    Returns:
+        OrderedDict: Result row with the keys `index`, `input`, `status`,
+            `error` and `descriptors`.
+    """
+    return OrderedDict(
+        (
+            ("index", index),
+            ("input", describe_input(item)),
+            ("status", status),
+            ("error", error),
+            ("descriptors", descriptors),
+        )
+    )
+
+
+def _load_checker(item: InputType, **kwargs):
+    from .. import MOFChecker  # pylint:disable=import-outside-toplevel
+
+    if isinstance(item, (str, os.PathLike)):
+        return MOFChecker.from_cif(item, **kwargs)
+    if isinstance(item, PackedStructure):
+        item = item.to_structure()
+    return MOFChecker(item, **kwargs)
+
+
+def run_check(
+    item: InputType,
+    descriptors: Optional[List[str]],
+    index: int,
+    kwargs: dict,
+    return_cif: bool = False,
+) -> Tuple[OrderedDict, Optional[str]]:
+    """Run the checks on one structure and return the result row.
+
+    Exceptions raised while reading or checking the structure
+    are recorded in the result row instead of being raised.
+
+    Args:
+        item (Union[PathType, StructureIStructureType]): Path to a CIF file,
+            a pymatgen structure or a packed structure.
+        descriptors (List[str], optional): Descriptors to compute, None for all.
+        index (int): Index of the structure in the input.
+        kwargs (dict): Passed to the :py:class:`~mofchecker.MOFChecker` constructor.
+        return_cif (bool): Also return the CIF of the checked structure
+            (e.g., to run external programs on it). Defaults to False.
+
+    Returns:
+        Tuple[OrderedDict, Optional[str]]: The result row and the CIF,
+            which is None if it was not requested or the check failed.
+    """
+    try:
+        mofchecker = _load_checker(item, **kwargs)
+        result = mofchecker.get_mof_descriptors(descriptors=descriptors)
+        cif = mofchecker.structure.to(fmt="cif") if return_cif else None
+    except PrescreenFailed as exc:
+        return make_record(index, item, "rejected", error=format_error(exc)), None
+    except MemoryError as exc:
+        return make_record(index, item, "oom", error=format_error(exc)), None
+    except Exception as exc:  # pylint:disable=broad-except
+        return make_record(index, item, "error", error=format_error(exc)), None
+    return make_record(index, item, "ok", descriptors=result), cif
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Order the inputs of a batch run such that the most expensive structures start first."""
+import heapq
+import itertools
+import os
+from typing import Iterable, Iterator, Tuple
+
+__all__ = ["MAX_WINDOW", "estimate_cost", "count_cif_atoms", "get_window", "longest_first"]
+
+# largest number of inputs that are buffered to sort them by cost
+MAX_WINDOW = 256
+
+_ATOM_SITE_TAGS = ("_atom_site_fract_x", "_atom_site_cartn_x")
+_SYMOP_TAGS = (
+    "_symmetry_equiv_pos_as_xyz",
+    "_space_group_symop_operation_xyz",
+    "_space_group_symop.operation_xyz",
+)
+
+
+def count_cif_atoms(path: str) -> int:
+    """Estimate the number of atoms in the unit cell from the CIF text.
+
+    Only the loops are tokenized (no coordinates are parsed), and the file
+    is only read up to the end of the first atom site loop
+    (the symmetry operations usually come before it),
+    hence this is much cheaper than reading the structure.
+    The estimate is the number of rows of the atom site loop
+    times the number of symmetry operations, i.e.,
+    atoms on special positions are counted more than once.
+
+    Args:
+        path (str): Path to the CIF file.
+
+    Returns:
+        int: Estimated number of atoms, 0 if no atom site loop was found.
+    """
+    atom_rows = 0
+    symops = 0
+    headers = None
+    rows = 0
+
+    def close_loop() -> bool:
+        """Count the rows of the current loop, return True for the atom site loop."""
+        nonlocal atom_rows, symops
+        if headers is None:
+            return False
+        if any(tag in headers for tag in _ATOM_SITE_TAGS):
+            atom_rows += rows
+            return True
+        if any(tag in headers for tag in _SYMOP_TAGS):
+            symops = max(symops, rows)
+        return False
+
+    with open(path, "r", errors="replace") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            lowered = line.lower()
+            if lowered.startswith("loop_"):
+                if close_loop():
+                    break
+                headers, rows = set(), 0
+            elif headers is not None and line.startswith("_") and rows == 0:
+                headers.add(lowered.split()[0])
+            elif line.startswith("_") or lowered.startswith("data_"):
+                if close_loop():
+                    break
+                headers = None
+            elif headers is not None:
+                rows += 1
+        else:
+            close_loop()
+    return atom_rows * max(1, symops)
+
+
+def estimate_cost(item) -> int:
+    """Estimate the relative cost of checking one input.
+
+    The cost of the checks grows steeply with the number of atoms,
+    hence the (estimated) number of atoms is used as cost.
+
+    Args:
+        item (Union[PathType, StructureIStructureType]): Path to a CIF file
+            or a pymatgen structure.
+
+    Returns:
+        int: Estimated number of atoms, 0 if it cannot be estimated
+            (e.g., for missing files, which fail fast).
+    """
+    if isinstance(item, (str, os.PathLike)):
+        try:
+            return count_cif_atoms(os.fspath(item))
+        except OSError:
+            return 0
+    try:
+        return len(item)
+    except TypeError:
+        return 0
+
+
+def get_window(workers: int) -> int:
+    """Return the number of inputs that are buffered for `workers` workers.
+
+    The first input is only dispatched when the window is full, hence the
+    window grows with the number of workers (to keep all of them busy)
+    but is capped to keep the time to the first result short.
+
+    Args:
+        workers (int): Number of workers.
+
+    Returns:
+        int: Four inputs per worker, at most `MAX_WINDOW`.
+    """
+    return min(4 * workers, MAX_WINDOW)
+
+
+def longest_first(
+    tasks: Iterable[Tuple[int, object]], window: int = MAX_WINDOW
+) -> Iterator[Tuple[int, object]]:
+    """Reorder (index, input) pairs such that expensive inputs come first.
+
+    To keep the input lazy, the inputs are only sorted within a sliding window:
+    up to `window` inputs are buffered and the most expensive one
+    is released whenever a new input is read.
+    For inputs shorter than the window this is an exact longest-first order,
+    which avoids that a large structure started last keeps
+    a single worker busy while all others are idle.
+
+    Args:
+        tasks (Iterable[Tuple[int, object]]): (index, input) pairs.
+        window (int): Maximum number of buffered inputs, see :py:func:`get_window`.
+            Defaults to `MAX_WINDOW`.
+
+    Yields:
+        Tuple[int, object]: The (index, input) pairs, most expensive first.
+    """
+    heap = []
+    counter = itertools.count()
+    for index, item in tasks:
+        # the counter keeps the input order for equal costs and avoids comparing inputs
+        heapq.heappush(heap, (-estimate_cost(item), next(counter), index, item))
+        if len(heap) > window:
+            _, _, index, item = heapq.heappop(heap)
+            yield index, item
+    while heap:
+        _, _, index, item = heapq.heappop(heap)
+        yield index, item
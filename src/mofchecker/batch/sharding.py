@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Split a corpus deterministically across independent jobs and merge the results."""
+import hashlib
+import json
+import os
+from typing import Iterable, Iterator, List, Tuple, Union
+
+__all__ = ["parse_shard", "shard_of", "in_shard", "read_results", "merge_results"]
+
+ShardType = Tuple[int, int]
+
+
+def parse_shard(shard: Union[str, ShardType]) -> ShardType:
+    """Parse a shard specification `i/N` into a tuple `(i, N)`.
+
+    Shards are counted from zero, i.e., `0/4`, `1/4`, `2/4` and `3/4`
+    cover the complete corpus.
+
+    Args:
+        shard (Union[str, Tuple[int, int]]): Shard specification.
+
+    Raises:
+        ValueError: If the specification is invalid.
+
+    Returns:
+        Tuple[int, int]: Shard index and number of shards.
+    """
+    if isinstance(shard, str):
+        try:
+            index, total = (int(part) for part in shard.split("/"))
+        except ValueError as exc:
+            raise ValueError(f"Shard must be of the form i/N, got {shard}") from exc
+    else:
+        index, total = shard
+    if total < 1 or not 0 <= index < total:
+        raise ValueError(f"Shard index must be in [0, {total}), got {index}")
+    return index, total
+
+
+def shard_of(path: str, total: int) -> int:
+    """Return the shard a path belongs to.
+
+    The shard only depends on the (normalized) path,
+    hence it does not change when files are added or removed.
+    Paths must be given in the same form (e.g., relative to the same directory)
+    in all jobs.
+
+    Args:
+        path (str): Path to the structure file.
+        total (int): Number of shards.
+
+    Returns:
+        int: Shard index.
+    """
+    digest = hashlib.sha256(os.path.normpath(path).encode()).digest()
+    return int.from_bytes(digest[:8], "big") % total
+
+
+def in_shard(tasks: Iterable[Tuple[int, object]], shard: ShardType) -> Iterator[Tuple[int, object]]:
+    """Keep only the (index, input) pairs that belong to the shard.
+
+    Paths are assigned based on their hash, other inputs
+    (e.g., structure objects) based on their index.
+    """
+    index_of_shard, total = shard
+    for index, item in tasks:
+        if isinstance(item, (str, os.PathLike)):
+            key = shard_of(os.fspath(item), total)
+        else:
+            key = index % total
+        if key == index_of_shard:
+            yield index, item
+
+
+def read_results(path: str) -> List[dict]:
+    """Read the output of a run, either a JSON list or JSON Lines."""
+    with open(path, "r") as handle:
+        content = handle.read()
+    if content.lstrip().startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def _is_record(row: dict) -> bool:
+    return "status" in row and "descriptors" in row
+
+
+def merge_results(paths: Iterable[str]) -> List[dict]:
+    """Concatenate the outputs of several (shard) runs into one result set.
+
+    Result records (JSON Lines output) are sorted by their input index,
+    and only the last record per input path is kept,
+    i.e., structures that were checked in several runs appear only once.
+    """
+    rows = []
+    for path in paths:
+        rows.extend(read_results(path))
+    if not rows or not all(_is_record(row) for row in rows):
+        return rows
+
+    unique = {}
+    for position, row in enumerate(rows):
+        key = row["input"] if row.get("input") is not None else ("position", position)
+        unique[key] = row
+    return sorted(unique.values(), key=lambda row: row["index"])
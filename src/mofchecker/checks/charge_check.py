@@ -1,13 +1,49 @@
 # -*- coding: utf-8 -*-
 """Check that the charges of the structure are reasonable."""
+import importlib.util
+import json
+import sys
 import warnings
 from tempfile import NamedTemporaryFile
+from typing import Union
 
 import numpy as np
 
 from .check_base import AbstractCheck
+from .utils import run_subprocess
 from ..types import StructureIStructureType
 
+NO_EQEQ_WARNING = "Install the eqeq extra to run the charge check"
+
+# runs EqEq in a fresh interpreter, without importing mofchecker
+_EQEQ_SCRIPT = """
+import json, sys
+from pyeqeq.main import run_on_cif
+print(json.dumps([float(charge) for charge in run_on_cif(sys.argv[1], verbose=False)]))
+"""
+
+
+async def ahas_reasonable_charges(structure_path: str, threshold: float = 3) -> Union[bool, None]:
+    """Run EqEq as asyncio subprocess and check that the charges are reasonable.
+
+    The event loop is not blocked while EqEq is running,
+    and the subprocess is killed if the awaiting task is cancelled.
+
+    Args:
+        structure_path (str): Path to a CIF file of the structure
+        threshold (float): Maximum absolute charge. Defaults to 3.
+
+    Returns:
+        Union[bool, None]: True if no charge is higher than the threshold,
+            None if EqEq is not installed.
+    """
+    if importlib.util.find_spec("pyeqeq") is None:
+        warnings.warn(NO_EQEQ_WARNING)
+        return None
+    stdout, _ = await run_subprocess([sys.executable, "-c", _EQEQ_SCRIPT, str(structure_path)])
+    charges = np.array(json.loads(stdout.strip().splitlines()[-1]))
+    return not np.sum(np.abs(charges) > threshold)
+
 
 class ChargeCheck(AbstractCheck):
     """Check that the charges of the structure are reasonable."""
@@ -43,5 +79,5 @@ class ChargeCheck(AbstractCheck):
 
             return not has_high_charges
         except ImportError:
-            warnings.warn("Install the eqeq extra to run the charge check")
+            warnings.warn(NO_EQEQ_WARNING)
             return None
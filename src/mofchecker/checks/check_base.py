@@ -3,7 +3,7 @@
 import abc
 from typing import List
 
-from backports.cached_property import cached_property
+from ..utils import cached_property
 
 
 class AbstractCheck(abc.ABC):
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 """Find connected components in the cell that do not cross PBC."""
-import networkx as nx
 from pymatgen.analysis.graphs import StructureGraph
-from structuregraph_helpers.subgraph import get_subgraphs_as_molecules
+
+from mofchecker.graph import PeriodicAdjacency, PeriodicComponents
 
 from .check_base import AbstractIndexCheck
+from ..utils import cached_property
 
 
 class FloatingSolventCheck(AbstractIndexCheck):
@@ -20,10 +21,12 @@ class FloatingSolventCheck(AbstractIndexCheck):
             structure_graph (StructureGraph): The structure graph to check.
         """
         self.structure_graph = structure_graph
-        nx.set_node_attributes(
-            self.structure_graph.graph,
-            name="idx",
-            values=dict(zip(range(len(structure_graph)), range(len(structure_graph)))),
+
+    @cached_property
+    def components(self) -> PeriodicComponents:
+        """Return the connected components of the structure graph."""
+        return PeriodicComponents.from_adjacency(
+            PeriodicAdjacency.from_structure_graph(self.structure_graph)
         )
 
     @property
@@ -35,10 +38,12 @@ class FloatingSolventCheck(AbstractIndexCheck):
     def from_mofchecker(cls, mofchecker):
         """Initialize a checker from a mofchecker instance."""
         checker = cls(mofchecker.graph)
+        checker.components = mofchecker.components
         return checker
 
     def _run_check(self):
-        _, _, idx, _, _ = get_subgraphs_as_molecules(self.structure_graph, return_unique=False)
+        # every molecule appears once, with its site indices in ascending order
+        idx = self.components.get_floating_components()
         return len(idx) == 0, idx
 
     @property
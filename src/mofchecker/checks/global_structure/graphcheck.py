@@ -1,7 +1,7 @@
 """Checks operating on the structure graph."""
-from pymatgen.analysis.dimensionality import get_dimensionality_larsen
-
 from mofchecker.checks.check_base import AbstractCheck
+from mofchecker.graph import PeriodicAdjacency, PeriodicComponents
+from mofchecker.utils import cached_property
 
 
 class BaseStructureGraphCheck(AbstractCheck):
@@ -15,10 +15,18 @@ class BaseStructureGraphCheck(AbstractCheck):
         """
         self.structure_graph = structure_graph
 
+    @cached_property
+    def components(self) -> PeriodicComponents:
+        """Return the connected components of the structure graph."""
+        return PeriodicComponents.from_adjacency(
+            PeriodicAdjacency.from_structure_graph(self.structure_graph)
+        )
+
     @classmethod
     def from_mofchecker(cls, mofchecker):
         """Initialize a checker from a mofchecker instance."""
         checker = cls(mofchecker.graph)
+        checker.components = mofchecker.components
         return checker
 
 
@@ -26,7 +34,8 @@ class IsThreeDimensional(BaseStructureGraphCheck):
     """Check if the structure is 3D."""
 
     def _run_check(self):
-        return bool(get_dimensionality_larsen(self.structure_graph) == 3)
+        # same dimensionality as pymatgen's get_dimensionality_larsen, without a supercell
+        return self.components.dimensionality == 3
 
     @property
     def name(self):
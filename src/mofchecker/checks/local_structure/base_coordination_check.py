@@ -2,12 +2,15 @@
 """Base class for checks on coordination numbers/environments."""
 import abc
 
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
-from structuregraph_helpers.analysis import get_cn
 
+from mofchecker.graph import PeriodicAdjacency
 from mofchecker.types import StructureIStructureType
 
 from ..check_base import AbstractIndexCheck
+from ..utils.get_indices import get_metal_indices
+from ...utils import cached_property
 
 
 class BaseCoordinationCheck(AbstractIndexCheck):
@@ -24,18 +27,40 @@ class BaseCoordinationCheck(AbstractIndexCheck):
         self.structure = structure
         self.structure_graph = structure_graph
 
+    @cached_property
+    def adjacency(self) -> PeriodicAdjacency:
+        """Return the neighbors of all sites in compact form."""
+        return PeriodicAdjacency.from_structure_graph(self.structure_graph)
+
+    @cached_property
+    def _is_metal(self) -> np.ndarray:
+        is_metal = np.zeros(len(self.structure), dtype=bool)
+        is_metal[get_metal_indices(self.structure)] = True
+        return is_metal
+
+    @cached_property
+    def coordination_numbers(self) -> np.ndarray:
+        """Return the coordination numbers of all sites."""
+        return self.adjacency.coordination_numbers
+
     def get_cn(self, index):
         """Get coordination number of index."""
-        return get_cn(self.structure_graph, index)
+        return int(self.coordination_numbers[index])
 
     def get_connected_sites(self, index):
         """Get sites connected to index."""
         return self.structure_graph.get_connected_sites(index)
 
+    def _is_any_neighbor_metal(self, index) -> bool:
+        """Return True if a site is bonded to a metal."""
+        return bool(self._is_metal[self.adjacency.get_neighbors(index)].any())
+
     @classmethod
     def from_mofchecker(cls, mofchecker):
         """Create a checker instance from a mofchecker instance."""
         checker = cls(mofchecker.structure, mofchecker.graph)
+        checker.adjacency = mofchecker.adjacency
+        checker.coordination_numbers = mofchecker.coordination_numbers
         checker.get_cn = mofchecker.get_cn
         checker.get_connected_sites = mofchecker.get_connected_sites
         return checker
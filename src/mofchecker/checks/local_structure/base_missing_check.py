@@ -2,11 +2,13 @@
 """Base class for checks for missing atoms, i.e., "undervalent" checks."""
 import abc
 
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
-from structuregraph_helpers.analysis import get_cn
 
 from ..check_base import AbstractMissingCheck
+from ...graph import PeriodicAdjacency
 from ...types import StructureIStructureType
+from ...utils import cached_property
 
 
 class BaseMissingCheck(AbstractMissingCheck):
@@ -23,9 +25,19 @@ class BaseMissingCheck(AbstractMissingCheck):
         self.structure = structure
         self.structure_graph = structure_graph
 
+    @cached_property
+    def adjacency(self) -> PeriodicAdjacency:
+        """Return the neighbors of all sites in compact form."""
+        return PeriodicAdjacency.from_structure_graph(self.structure_graph)
+
+    @cached_property
+    def coordination_numbers(self) -> np.ndarray:
+        """Return the coordination numbers of all sites."""
+        return self.adjacency.coordination_numbers
+
     def get_cn(self, index):
         """Get coordination number of index."""
-        return get_cn(self.structure_graph, index)
+        return int(self.coordination_numbers[index])
 
     def get_connected_sites(self, index):
         """Get sites connected to index."""
@@ -35,6 +47,8 @@ class BaseMissingCheck(AbstractMissingCheck):
     def from_mofchecker(cls, mofchecker):
         """Initialize a checker instance from a mofchecker instance."""
         checker = cls(mofchecker.structure, mofchecker.graph)
+        checker.adjacency = mofchecker.adjacency
+        checker.coordination_numbers = mofchecker.coordination_numbers
         checker.get_cn = mofchecker.get_cn
         checker.get_connected_sites = mofchecker.get_connected_sites
         return checker
@@ -82,11 +82,11 @@ class FalseOxoCheck(BaseCoordinationCheck):
 
         for site_index in self.metal_indices:
             if str(self.structure[site_index].specie) in NO_TERMINAL_OXO:
-
-                neighbors = self.get_connected_sites(site_index)
-                for neighbor in neighbors:
-                    neighbor_neighbors = self.get_connected_sites(neighbor.index)
-                    if len(neighbor_neighbors) == 1 and str(neighbor.site.specie) == "O":
-                        wrong_oxo.append(neighbor_neighbors[0].index)
+                for neighbor_index in self.adjacency.get_neighbors(site_index).tolist():
+                    if (
+                        self.get_cn(neighbor_index) == 1
+                        and str(self.structure[neighbor_index].specie) == "O"
+                    ):
+                        wrong_oxo.append(int(self.adjacency.get_neighbors(neighbor_index)[0]))
 
         return wrong_oxo
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Check if there are any metals that are sterically exposed."""
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
 
 from .base_coordination_check import BaseCoordinationCheck
@@ -66,11 +67,11 @@ class GeometricallyExposedMetal(BaseCoordinationCheck):
         """Check for all geometrically exposed metals."""
         geometrically_exposed_metals = []
 
-        for site_index in self.relevant_metals:
+        # the open angle is only computed for metals with few neighbors
+        indices = np.array(self.relevant_metals, dtype=int)
+        for site_index in indices[self.coordination_numbers[indices] < 6].tolist():
             angle = get_open_angle(self.structure_graph, site_index)
-            # print(angle, self.get_cn(site_index), site_index)
             if angle > self.threshold:
-                if self.get_cn(site_index) < 6:
-                    geometrically_exposed_metals.append(site_index)
+                geometrically_exposed_metals.append(site_index)
 
         return geometrically_exposed_metals
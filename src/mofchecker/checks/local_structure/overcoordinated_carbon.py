@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 """Check if there are carbons with more neighbors than expected."""
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
 
 from mofchecker.types import StructureIStructureType
 
 from .base_coordination_check import BaseCoordinationCheck
-from ..utils.get_indices import _is_any_neighbor_metal, get_c_indices
+from ..utils.get_indices import get_c_indices
 
 
 class OverCoordinatedCarbonCheck(BaseCoordinationCheck):
@@ -39,11 +40,9 @@ class OverCoordinatedCarbonCheck(BaseCoordinationCheck):
 
     def _get_overcoordinated_carbons(self):
         """Check for all C if CN>4, ignore metal bonds."""
-        overcoordinated_carbons = []
-
-        for site_index in self.c_indices:
-            cn = self.get_cn(site_index)  # pylint:disable=invalid-name
-            if cn > 4 and not _is_any_neighbor_metal(self.get_connected_sites(site_index)):
-                overcoordinated_carbons.append(site_index)
-
-        return overcoordinated_carbons
+        indices = np.array(self.c_indices, dtype=int)
+        return [
+            site_index
+            for site_index in indices[self.coordination_numbers[indices] > 4].tolist()
+            if not self._is_any_neighbor_metal(site_index)
+        ]
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 """Flagging overcoordinated hydrogens."""
+from typing import Optional
+
 from pymatgen.analysis.graphs import StructureGraph
 
 from mofchecker.types import StructureIStructureType
@@ -12,17 +14,25 @@ from ..utils.get_indices import get_h_indices
 class OverCoordinatedHydrogenCheck(BaseCoordinationCheck):
     """Flagging overcoordinated hydrogens."""
 
-    def __init__(self, structure: StructureIStructureType, structure_graph: StructureGraph):
+    def __init__(
+        self, structure: StructureIStructureType, structure_graph: Optional[StructureGraph] = None
+    ):
         """Initialize the OverCoordinatedHydrogenCheck check.
 
         Args:
             structure (StructureIStructureType): The structure to check.
-            structure_graph (StructureGraph): The structure graph to use for the check.
+            structure_graph (StructureGraph, optional): The structure graph of the structure.
+                Not used, as the check is purely geometric. Defaults to None.
         """
         self.structure = structure
         self.h_indices = get_h_indices(self.structure)
         self.structure_graph = structure_graph
 
+    @classmethod
+    def from_mofchecker(cls, mofchecker):
+        """Create a checker instance without building the structure graph."""
+        return cls(mofchecker.structure)
+
     @property
     def name(self):
         """Return the name of the check."""
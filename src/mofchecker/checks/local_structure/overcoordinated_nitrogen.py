@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 """Checks, using geometric heuristics if there are any carbons that are likely overcoordinated (i.e., CN>4)."""
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
 
 from mofchecker.types import StructureIStructureType
 
 from .base_coordination_check import BaseCoordinationCheck
-from ..utils.get_indices import _is_any_neighbor_metal, get_n_indices
+from ..utils.get_indices import get_n_indices
 
 
 class OverCoordinatedNitrogenCheck(BaseCoordinationCheck):
@@ -39,11 +40,9 @@ class OverCoordinatedNitrogenCheck(BaseCoordinationCheck):
 
     def _get_overcoordinated_nitrogen(self):
         """Check for all N if CN>4, ignore metal bonds."""
-        overcoordinated_nitrogen = []
-
-        for site_index in self.n_indices:
-            cn = self.get_cn(site_index)  # pylint:disable=invalid-name
-            if cn > 4 and not _is_any_neighbor_metal(self.get_connected_sites(site_index)):
-                overcoordinated_nitrogen.append(site_index)
-
-        return overcoordinated_nitrogen
+        indices = np.array(self.n_indices, dtype=int)
+        return [
+            site_index
+            for site_index in indices[self.coordination_numbers[indices] > 4].tolist()
+            if not self._is_any_neighbor_metal(site_index)
+        ]
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Checks if there are atomic overlaps, based on dist < min(covr 1, covr 2)."""
-import warnings
+from typing import Optional
 
 import numpy as np
 from pymatgen.core import Structure
@@ -15,22 +15,32 @@ from ..data import _get_covalent_radius
 class AtomicOverlapCheck(AbstractIndexCheck):
     """Checks if there are atomic overlaps, based on dist < min(covr 1, covr 2)."""
 
-    def __init__(self, structure: StructureIStructureType):
+    def __init__(
+        self, structure: StructureIStructureType, distance_matrix: Optional[np.ndarray] = None
+    ):
         """Initialize the check.
 
         Args:
             structure (StructureIStructureType): The structure to check.
+            distance_matrix (np.ndarray, optional): Pairwise distances of the structure.
+                Defaults to None, i.e., they are computed when the check runs.
         """
         self.structure = structure
+        self.distance_matrix = distance_matrix
         self.indices = None
 
+    @classmethod
+    def from_mofchecker(cls, mofchecker):
+        """Create a check that reuses the distance matrix of a mofchecker instance."""
+        return cls(mofchecker.structure, mofchecker.distance_matrix)
+
     @property
     def name(self):
         """Return the name of the check."""
         return "Atomic overlaps"
 
     def _run_check(self):
-        overlaps = _get_overlaps(self.structure)
+        overlaps = _get_overlaps(self.structure, self.distance_matrix)
         return len(overlaps) == 0, overlaps
 
     @property
@@ -53,25 +63,19 @@ def _compute_overlap_matrix(distance_matrix: np.array, allatomtypes: list, toler
     Returns:
         overlap_matrix (sparse matrix): overlap matrix
     """
-    with warnings.catch_warnings():
-        warnings.filterwarnings("once")  # only warn once for missing radius data
-
-        overlap_matrix = np.zeros(distance_matrix.shape)
-        for i, elem_1 in enumerate(allatomtypes[:-1]):
-            for j, elem_2 in enumerate(allatomtypes[i + 1 :]):
-                dist = distance_matrix[i, i + j + 1]
-                # check for atomic overlap:
-                if dist < tolerance * min(
-                    _get_covalent_radius(elem_1), _get_covalent_radius(elem_2)
-                ):
-                    overlap_matrix[i, i + j + 1] = 1
-                    overlap_matrix[i + j + 1, i] = 1
+    # one lookup per element, such that a missing radius is only warned about once
+    radii = {elem: _get_covalent_radius(elem) for elem in set(allatomtypes)}
+    radius = np.array([radii[elem] for elem in allatomtypes])
+
+    overlap_matrix = distance_matrix < tolerance * np.minimum.outer(radius, radius)
+    np.fill_diagonal(overlap_matrix, False)
     return sparse.csr_matrix(overlap_matrix)
 
 
-def _get_overlaps(s: Structure) -> list:
+def _get_overlaps(s: Structure, distance_matrix: Optional[np.ndarray] = None) -> list:
     """Find overlapping atoms in a structure."""
-    distance_matrix = s.distance_matrix
+    if distance_matrix is None:
+        distance_matrix = s.distance_matrix
     atomtypes = [str(species) for species in s.species]
     overlap_matrix = _compute_overlap_matrix(distance_matrix, atomtypes)
     overlap_atoms = []
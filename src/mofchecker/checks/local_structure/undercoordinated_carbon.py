@@ -66,7 +66,8 @@ class UnderCoordinatedCarbonCheck(BaseMissingCheck):
         undercoordinated_carbons = []
         h_positions = []  # output must be list of lists to allow for filtering
 
-        for site_index in self.c_indices:
+        indices = np.array(self.c_indices, dtype=int)
+        for site_index in indices[np.isin(self.coordination_numbers[indices], (1, 2))].tolist():
             cn = self.get_cn(site_index)  # pylint:disable=invalid-name
             neighbors = self.get_connected_sites(site_index)
             if cn == 1:
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Check for undercoordinated nitrogens."""
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
 
 from mofchecker.types import StructureIStructureType
@@ -59,7 +60,8 @@ class UnderCoordinatedNitrogenCheck(BaseMissingCheck):
         """
         undercoordinated_nitrogens = []
         h_positions = []
-        for site_index in self.n_indices:
+        indices = np.array(self.n_indices, dtype=int)
+        for site_index in indices[np.isin(self.coordination_numbers[indices], (1, 2, 3))].tolist():
             cn = self.get_cn(site_index)  # pylint:disable=invalid-name
             neighbors = self.get_connected_sites(site_index)
             if cn == 1:
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Check if there are any lanthanides/actinides that are likely undercoordinated (i.e., CN<4)."""
+import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
 
 from .base_coordination_check import BaseCoordinationCheck
@@ -41,11 +42,5 @@ class UnderCoordinatedRareEarthCheck(BaseCoordinationCheck):
 
     def _get_undercoordinated_rare_earth_metals(self):
         """Check for all rare earth metals if CN < 4."""
-        undercoordinated_rare_earth_metals = []
-
-        for site_index in self.rare_earth_indices:
-            cn = self.get_cn(site_index)  # pylint:disable=invalid-name
-            if cn < 4:
-                undercoordinated_rare_earth_metals.append(site_index)
-
-        return undercoordinated_rare_earth_metals
+        indices = np.array(self.rare_earth_indices, dtype=int)
+        return indices[self.coordination_numbers[indices] < 4].tolist()
@@ -5,14 +5,15 @@ from typing import List
 import numpy as np
 from pymatgen.analysis.graphs import StructureGraph
 from pymatgen.analysis.local_env import LocalStructOrderParams
-from structuregraph_helpers.analysis import get_cn
 
 from .definitions import OP_DEF
 from .errors import HighCoordinationNumber, LowCoordinationNumber
 from ..check_base import AbstractIndexCheck
 from ..utils.get_indices import get_metal_indices
 from ...errors import NoMetal
+from ...graph import PeriodicAdjacency
 from ...types import StructureIStructureType
+from ...utils import cached_property
 
 
 class MOFOMS(AbstractIndexCheck):
@@ -42,14 +43,26 @@ class MOFOMS(AbstractIndexCheck):
         """Return a description of the check."""
         return "Check if there are any open metal sites in the structure."
 
+    @cached_property
+    def adjacency(self) -> PeriodicAdjacency:
+        """Return the neighbors of all sites in compact form."""
+        return PeriodicAdjacency.from_structure_graph(self.structure_graph)
+
+    @cached_property
+    def coordination_numbers(self) -> np.ndarray:
+        """Return the coordination numbers of all sites."""
+        return self.adjacency.coordination_numbers
+
     def get_cn(self, index):
         """Return the coordination number."""
-        return get_cn(self.structure_graph, index)
+        return int(self.coordination_numbers[index])
 
     @classmethod
     def from_mofchecker(cls, mofchecker):
         """Initialize a OMS check from a mofchecker instance."""
         checker = cls(mofchecker.structure, mofchecker.graph)
+        checker.adjacency = mofchecker.adjacency
+        checker.coordination_numbers = mofchecker.coordination_numbers
         checker.get_cn = mofchecker.get_cn
         return checker
 
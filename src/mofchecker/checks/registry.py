@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Registry that creates the checks of a MOFChecker instance on first access."""
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+__all__ = ["CheckRegistry"]
+
+
+class CheckRegistry(Mapping):
+    """Read-only mapping from check names to check instances.
+
+    Every check is only created when it is accessed for the first time,
+    such that, e.g., the structure graph is only computed if a check needs it.
+    """
+
+    def __init__(self, mofchecker, factories: Dict[str, Callable[[Any], Any]]):
+        """Create a registry.
+
+        Args:
+            mofchecker (MOFChecker): The instance the checks are created for.
+            factories (Dict[str, Callable]): Functions that create a check
+                from the MOFChecker instance, by name of the check.
+        """
+        self._mofchecker = mofchecker
+        self._factories = factories
+        self._checks = {}
+
+    def __getitem__(self, name: str):
+        """Return the check, create it if it does not exist yet."""
+        try:
+            return self._checks[name]
+        except KeyError:
+            check = self._factories[name](self._mofchecker)
+            # if another thread created the check meanwhile, all threads use its instance
+            return self._checks.setdefault(name, check)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of all checks."""
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        """Return the number of checks."""
+        return len(self._factories)
+
+    def discard(self, names: Iterable[str]) -> None:
+        """Drop checks, they are created again on the next access."""
+        for name in names:
+            self._checks.pop(name, None)
+
+    def is_created(self, name: str) -> bool:
+        """Return True if the check was already created."""
+        return name in self._checks
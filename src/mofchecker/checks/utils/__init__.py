@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Helper functions for the check functions."""
+import asyncio
 from shutil import which
+from subprocess import CalledProcessError
+from typing import List, Tuple
 
 
 def is_tool(name: str) -> bool:
@@ -15,3 +18,32 @@ def is_tool(name: str) -> bool:
         bool: Whether the tool is on PATH.
     """
     return which(name) is not None
+
+
+async def run_subprocess(cmd: List[str]) -> Tuple[str, str]:
+    """Run a command as asyncio subprocess without blocking the event loop.
+
+    If the awaiting task is cancelled, the process is killed.
+
+    Args:
+        cmd (List[str]): The command and its arguments.
+
+    Raises:
+        CalledProcessError: If the command returns a non-zero exit code.
+
+    Returns:
+        Tuple[str, str]: stdout and stderr of the command.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if process.returncode != 0:
+        raise CalledProcessError(process.returncode, cmd, stdout, stderr)
+    return stdout.decode(errors="replace"), stderr.decode(errors="replace")
@@ -126,7 +126,3 @@ def get_indices(structure: Union[Structure, IStructure]) -> dict:
     if isinstance(structure, Structure):
         structure = IStructure.from_sites(structure)
     return _get_indices(structure)
-
-
-def _is_any_neighbor_metal(neighbors):
-    return any(is_metal(neighbor.site) for neighbor in neighbors)
@@ -10,14 +10,20 @@ import numpy as np
 from pymatgen.core import Structure
 
 from .check_base import AbstractCheck
-from .utils import is_tool
+from .utils import is_tool, run_subprocess
 from ..types import StructureIStructureType
 
 ZEOPP_BASE_COMMAND = ["network", "-ha", "-res"]
 NO_ZEOPP_WARNING = "Did not find the zeo++ network binary in the path. \
             Can not run pore analysis."
 
-__all__ = ["check_if_porous"]
+__all__ = ["check_if_porous", "acheck_if_porous"]
+
+_NAN_RESULTS = {
+    "lis": np.nan,  # largest included sphere
+    "lifs": np.nan,  # largest free sphere
+    "lifsp": np.nan,  # largest included sphere along free sphere path
+}
 
 
 def run_zeopp(structure: Structure) -> dict:
@@ -51,11 +57,31 @@ def run_zeopp(structure: Structure) -> dict:
             return zeopp_results
     else:
         warnings.warn(NO_ZEOPP_WARNING)
-        return {
-            "lis": np.nan,  # largest included sphere
-            "lifs": np.nan,  # largest free sphere
-            "lifsp": np.nan,  # largest included sphere along free sphere path
-        }
+        return dict(_NAN_RESULTS)
+
+
+async def arun_zeopp(structure_path: str) -> dict:
+    """Run zeopp as asyncio subprocess to find the pore diameters.
+
+    The event loop is not blocked while zeo++ is running,
+    and zeo++ is killed if the awaiting task is cancelled.
+
+    Args:
+        structure_path (str): Path to a CIF file of the structure
+
+    Returns:
+        dict: pore analysis results
+    """
+    if not is_tool("network"):
+        warnings.warn(NO_ZEOPP_WARNING)
+        return dict(_NAN_RESULTS)
+
+    with TemporaryDirectory() as tempdir:
+        result_path = os.path.join(tempdir, "result.res")
+        await run_subprocess(ZEOPP_BASE_COMMAND + [result_path, str(structure_path)])
+        with open(result_path, "r") as handle:
+            results = handle.read()
+    return _parse_zeopp(results)
 
 
 def _parse_zeopp(filecontent: str) -> dict:
@@ -103,6 +129,24 @@ def check_if_porous(structure: Structure, threshold: float = 2.4) -> Union[bool,
     return None
 
 
+async def acheck_if_porous(structure_path: str, threshold: float = 2.4) -> Union[bool, None]:
+    """Run zeo++ as asyncio subprocess to check if structure is porous.
+
+    Args:
+        structure_path (str): Path to a CIF file of the structure
+        threshold (float): Threshold on the sphere diameter in Angstrom.
+            Defaults to 2.4.
+
+    Returns:
+        bool: True if porous, None if zeo++ is not installed.
+    """
+    if not is_tool("network"):
+        warnings.warn(NO_ZEOPP_WARNING)
+        return None
+    zeopp_results = await arun_zeopp(structure_path)
+    return bool(zeopp_results["lifs"] >= threshold)
+
+
 class PorosityCheck(AbstractCheck):
     """Use zeo++ to check if the structure is porous."""
 
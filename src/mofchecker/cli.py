@@ -2,40 +2,405 @@
 """Command line interface."""
 
 import json
+import warnings
 
 import click
 
-from mofchecker import DESCRIPTORS, MOFChecker
+import mofchecker_client
+from mofchecker import DESCRIPTORS, PROFILES, MOFChecker
+from mofchecker.batch import BACKENDS, iter_input_paths, merge_results, parse_shard
+from mofchecker.server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_REQUEST_TIMEOUT
+from mofchecker.server import serve as run_server
 
 
-@click.command()
+class DefaultGroup(click.Group):
+    """Group that invokes the `run` command if no subcommand is given.
+
+    This keeps `mofchecker structure.cif` working next to subcommands
+    like `mofchecker merge`.
+    """
+
+    default_command = "run"
+
+    def parse_args(self, ctx, args):
+        """Prepend the default command if the first argument is not a subcommand."""
+        if not args or (args[0] not in self.commands and args[0] not in ("--help", "-h")):
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+def _validate_shard(ctx, param, value):  # pylint:disable=unused-argument
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc)) from exc
+
+
+def _print_json(results, file=None):
+    # Note: we want to see output as things progress,
+    # thus this clumsy way of creating a JSON list
+    print("[", file=file)  # noqa: T201
+    first = True
+    for result in results:
+        if "status" in result:
+            if result["status"] != "ok":
+                click.echo(f"{result['input']}: {result['error']}", err=True)
+                continue
+            result = result["descriptors"]
+        string = json.dumps(result, indent=2)
+        if not first:
+            string = "," + string
+        first = False
+        print(string, flush=True, file=file)  # noqa: T201
+    print("]", file=file)  # noqa: T201
+
+
+def _print_jsonl(results, file=None):
+    for result in results:
+        print(json.dumps(result, separators=(",", ":")), flush=True, file=file)  # noqa: T201
+
+
+@click.group(cls=DefaultGroup)
+def main():
+    """Perform sanity checks for MOFs.
+
+    Without subcommand, the structures are checked (see `mofchecker run --help`).
+    """
+
+
+@main.command()
 @click.option(
     "--primitive/--no-primitive",
     default=True,
     help="Perform the analysis on the primitive structure",
     show_default=True,
 )
+@click.option(
+    "--defer-symmetrization",
+    is_flag=True,
+    help="Only run the symmetry analysis if a symmetry descriptor is requested.",
+)
+@click.option(
+    "--prescreen",
+    is_flag=True,
+    help="Reject structures that fail the checks that do not need a structure graph "
+    "(ordered sites, composition, overlaps) before the expensive analysis.",
+)
+@click.option(
+    "--background-tools",
+    is_flag=True,
+    help="Run zeo++ and EqEq in background threads while the other checks are computed.",
+)
 @click.option(
     "--descriptors",
     "-d",
     multiple=True,
     type=click.Choice(DESCRIPTORS),
-    default=DESCRIPTORS,
-    help="Select descriptors to be computed.",
-    show_default=False,
+    help="Select descriptors to be computed (overrides --profile).",
 )
-@click.argument("CIF_FILES", type=click.Path(exists=True, dir_okay=False), nargs=-1)
-def run(primitive, descriptors, cif_files):
-    """Check provided structures and print list of JSON objects with descriptors."""
-    # Note: we want to see output as things progress,
-    # thus this clumsy way of creating a JSON list
-    print("[")  # noqa: T201
-    for index, structure_file in enumerate(cif_files):
-        mofchecker = MOFChecker.from_cif(structure_file, primitive=primitive)
-        descriptors = mofchecker.get_mof_descriptors(descriptors=descriptors)
-
-        string = json.dumps(descriptors, indent=2)
-        if index != len(cif_files) - 1:
-            string += ","
-        print(string)  # noqa: T201
-    print("]")  # noqa: T201
+@click.option(
+    "--profile",
+    type=click.Choice(list(PROFILES)),
+    default="full",
+    help="Compute a predefined set of descriptors: fast (composition, overlaps and "
+    "coordination), standard (adds hashes and symmetry) or full (adds zeo++ and EqEq).",
+    show_default=True,
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of worker processes. 0 uses all CPUs.",
+    show_default=True,
+)
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    default=None,
+    help="Check the structures in worker processes, threads or serially "
+    "(default: process, or serial with --jobs 1).",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "jsonl"]),
+    default="json",
+    help="Print a JSON list of descriptors or one compact JSON record per structure "
+    "(JSON Lines) as soon as it is done.",
+    show_default=True,
+)
+@click.option(
+    "--from-file",
+    type=click.File("r"),
+    default=None,
+    help="Read paths, directories or glob patterns from a file, one per line. "
+    "Use - to read them from stdin.",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Wall-clock limit per structure in seconds. "
+    "Workers that exceed it are killed and the structure gets the status timeout.",
+)
+@click.option(
+    "--max-memory",
+    type=str,
+    default=None,
+    help="Memory limit per worker, e.g., 4G. Structures that exceed it get the status oom.",
+)
+@click.option(
+    "--max-tasks-per-worker",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Replace worker processes after this number of structures.",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Record finished structures in this manifest (SQLite database) and "
+    "skip structures that are already recorded, e.g., to resume an interrupted run. "
+    "Structures that failed (error, timeout or oom) are not recorded and are checked again.",
+)
+@click.option(
+    "--shard",
+    type=str,
+    callback=_validate_shard,
+    default=None,
+    help="Check only shard i/N (counted from zero) of the inputs. "
+    "The assignment is based on a hash of the path and stable when files are added.",
+)
+@click.option(
+    "--schedule",
+    type=click.Choice(["size", "input"]),
+    default="size",
+    help="Start the largest structures first (estimated from the CIF files) "
+    "or check them in input order.",
+    show_default=True,
+)
+@click.argument("CIF_FILES", type=str, nargs=-1)
+def run(  # pylint:disable=too-many-arguments
+    primitive,
+    defer_symmetrization,
+    prescreen,
+    background_tools,
+    descriptors,
+    profile,
+    jobs,
+    backend,
+    output_format,
+    from_file,
+    timeout,
+    max_memory,
+    max_tasks_per_worker,
+    checkpoint,
+    shard,
+    schedule,
+    cif_files,
+):
+    """Check provided structures and print list of JSON objects with descriptors.
+
+    CIF_FILES can be files, directories (searched recursively for CIF files)
+    or glob patterns (quote them to avoid expansion by the shell).
+    Inputs are enumerated lazily, i.e., checking starts
+    before all files have been found.
+
+    With `--format jsonl`, every line is a record with the input index and path,
+    the status, a possible error message and the descriptors.
+
+    With `--prescreen`, rejected structures are reported like errors
+    (with the status `rejected` in the JSON Lines output).
+
+    With `--checkpoint`, structures that were finished in a previous run with the
+    same settings are skipped and do not appear in the output.
+    Structures that failed with an error, timeout or oom are checked again.
+    """
+    # deprecation warnings of the dependencies are not helpful for users of the command line
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    limits = (timeout, max_memory, max_tasks_per_worker)
+    if backend not in (None, "process") and any(limit is not None for limit in limits):
+        raise click.UsageError("Limits are only supported for the process backend.")
+    paths = iter_input_paths(cif_files, from_file)
+    results = MOFChecker.check_many(
+        paths,
+        descriptors=list(descriptors) or PROFILES[profile],
+        workers=jobs or None,
+        timeout=timeout,
+        max_memory=max_memory,
+        max_tasks_per_worker=max_tasks_per_worker,
+        checkpoint=checkpoint,
+        shard=shard,
+        schedule=schedule,
+        executor=backend,
+        primitive=primitive,
+        defer_symmetrization=defer_symmetrization,
+        prescreen=prescreen,
+        background_tools=background_tools,
+    )
+    if output_format == "jsonl":
+        _print_jsonl(results)
+    else:
+        _print_json(results)
+
+
+@main.command()
+@click.argument("FILES", type=click.Path(exists=True, dir_okay=False), nargs=-1, required=True)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "jsonl"]),
+    default="jsonl",
+    help="Print a JSON list of descriptors or one JSON record per line.",
+    show_default=True,
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="File to write the merged results to.",
+    show_default=True,
+)
+def merge(files, output_format, output):
+    """Merge the outputs of several (shard) runs into one result set.
+
+    FILES can be JSON or JSON Lines outputs of `mofchecker run`.
+    JSON Lines records are sorted by input index and
+    only the last record per input path is kept.
+    """
+    results = merge_results(files)
+    if output_format == "jsonl":
+        _print_jsonl(results, file=output)
+    else:
+        _print_json(results, file=output)
+
+
+@main.command()
+@click.option("--host", default=DEFAULT_HOST, help="Address to listen on.", show_default=True)
+@click.option(
+    "--port", type=int, default=DEFAULT_PORT, help="Port to listen on.", show_default=True
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of worker processes. 0 uses all CPUs.",
+    show_default=True,
+)
+@click.option(
+    "--max-queue",
+    type=click.IntRange(min=1),
+    default=256,
+    help="Maximum number of queued structures. Further requests are rejected (HTTP 503).",
+    show_default=True,
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=8,
+    help="Maximum number of structures sent to a worker at once.",
+    show_default=True,
+)
+@click.option(
+    "--request-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_REQUEST_TIMEOUT,
+    help="Time in seconds after which a request fails (HTTP 504).",
+    show_default=True,
+)
+@click.option(
+    "--allow-paths/--no-allow-paths",
+    default=None,
+    help="Accept paths (instead of CIF content) in requests, which lets clients make the "
+    "server read any file it can read (default: only with a loopback --host).",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Log every request.")
+def serve(  # pylint:disable=too-many-arguments
+    host, port, jobs, max_queue, batch_size, request_timeout, allow_paths, verbose
+):
+    """Run a local HTTP service with warm worker processes.
+
+    Use `mofchecker client` (or the faster `mofchecker-client`, which does not
+    import mofchecker) to send structures to the service.
+
+    Requests can name files on the server (`mofchecker client --paths`) only if
+    the service listens on a loopback address, like the default --host,
+    or with --allow-paths. Do not allow paths on a network address
+    unless all clients may read all files of the server.
+    """
+    click.echo(f"Serving on http://{host}:{port}", err=True)
+    run_server(
+        host=host,
+        port=port,
+        workers=jobs or None,
+        max_queue=max_queue,
+        batch_size=batch_size,
+        verbose=verbose,
+        allow_paths=allow_paths,
+        request_timeout=request_timeout,
+    )
+
+
+@main.command()
+@click.argument("CIF_FILES", type=click.Path(exists=True, dir_okay=False), nargs=-1, required=True)
+@click.option(
+    "--url", default=mofchecker_client.DEFAULT_URL, help="URL of the service.", show_default=True
+)
+@click.option(
+    "--primitive/--no-primitive",
+    default=True,
+    help="Perform the analysis on the primitive structure",
+    show_default=True,
+)
+@click.option(
+    "--descriptors",
+    "-d",
+    multiple=True,
+    type=click.Choice(DESCRIPTORS),
+    help="Select descriptors to be computed (overrides --profile).",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(list(PROFILES)),
+    default="full",
+    help="Compute a predefined set of descriptors: fast (composition, overlaps and "
+    "coordination), standard (adds hashes and symmetry) or full (adds zeo++ and EqEq).",
+    show_default=True,
+)
+@click.option(
+    "--paths",
+    "send_paths",
+    is_flag=True,
+    help="Send the paths instead of the file content (same file system only).",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "jsonl"]),
+    default="json",
+    help="Print a JSON list of descriptors or one JSON record per structure.",
+    show_default=True,
+)
+def client(  # pylint:disable=too-many-arguments
+    cif_files, url, primitive, descriptors, profile, send_paths, output_format
+):
+    """Check structures with a running `mofchecker serve`."""
+    try:
+        results = mofchecker_client.check(
+            cif_files,
+            url=url,
+            descriptors=list(descriptors) or PROFILES[profile],
+            send_paths=send_paths,
+            options={"primitive": primitive},
+        )
+    except (OSError, RuntimeError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    if output_format == "jsonl":
+        _print_jsonl(results)
+    else:
+        _print_json(results)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Descriptors of the MOFChecker and the artifacts they depend on."""
+from typing import Dict, Iterable, List, Tuple
+
+__all__ = [
+    "ARTIFACTS",
+    "DESCRIPTORS",
+    "DESCRIPTOR_DEPENDENCIES",
+    "PROFILES",
+    "PROFILE_COSTS",
+    "get_profile",
+    "plan_artifacts",
+]
+
+DESCRIPTORS = [
+    "name",
+    "graph_hash",
+    "undecorated_graph_hash",
+    "decorated_scaffold_hash",
+    "undecorated_scaffold_hash",
+    "symmetry_hash",
+    "formula",
+    "path",
+    "density",
+    "has_carbon",
+    "has_hydrogen",
+    "has_atomic_overlaps",
+    "has_overcoordinated_c",
+    "has_overcoordinated_n",
+    "has_overcoordinated_h",
+    "has_undercoordinated_c",
+    "has_undercoordinated_n",
+    "has_undercoordinated_rare_earth",
+    "has_metal",
+    "has_lone_molecule",
+    "has_high_charges",
+    "is_porous",
+    "has_suspicicious_terminal_oxo",
+    "has_undercoordinated_alkali_alkaline",
+    "has_geometrically_exposed_metal",
+    "has_3d_connected_graph",
+]
+
+# expensive intermediate results, in the order in which they are built:
+# graph: structure graph (bonds), symmetry: symmetrized structure,
+# distance_matrix: all pairwise distances, zeopp: pore analysis with zeo++,
+# eqeq: EqEq charges
+ARTIFACTS = ("graph", "symmetry", "distance_matrix", "zeopp", "eqeq")
+
+DESCRIPTOR_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "name": (),
+    "graph_hash": ("graph",),
+    "undecorated_graph_hash": ("graph",),
+    "decorated_scaffold_hash": ("graph",),
+    "undecorated_scaffold_hash": ("graph",),
+    "symmetry_hash": ("symmetry",),
+    "formula": (),
+    "path": (),
+    "density": (),
+    "has_carbon": (),
+    "has_hydrogen": (),
+    "has_atomic_overlaps": ("distance_matrix",),
+    "has_overcoordinated_c": ("graph",),
+    "has_overcoordinated_n": ("graph",),
+    "has_overcoordinated_h": (),
+    "has_undercoordinated_c": ("graph",),
+    "has_undercoordinated_n": ("graph",),
+    "has_undercoordinated_rare_earth": ("graph",),
+    "has_metal": (),
+    "has_lone_molecule": ("graph",),
+    "has_high_charges": ("eqeq",),
+    "is_porous": ("zeopp",),
+    "has_suspicicious_terminal_oxo": ("graph",),
+    "has_undercoordinated_alkali_alkaline": ("graph",),
+    "has_geometrically_exposed_metal": ("graph",),
+    "has_3d_connected_graph": ("graph",),
+}
+
+_FAST = {
+    "name",
+    "formula",
+    "path",
+    "density",
+    "has_carbon",
+    "has_hydrogen",
+    "has_metal",
+    "has_atomic_overlaps",
+    "has_overcoordinated_c",
+    "has_overcoordinated_n",
+    "has_overcoordinated_h",
+    "has_undercoordinated_c",
+    "has_undercoordinated_n",
+    "has_undercoordinated_rare_earth",
+    "has_undercoordinated_alkali_alkaline",
+}
+_STANDARD = _FAST | {
+    "graph_hash",
+    "undecorated_graph_hash",
+    "decorated_scaffold_hash",
+    "undecorated_scaffold_hash",
+    "symmetry_hash",
+    "has_lone_molecule",
+    "has_suspicicious_terminal_oxo",
+    "has_geometrically_exposed_metal",
+    "has_3d_connected_graph",
+}
+
+# descriptor sets of increasing cost, every profile contains the previous ones.
+# fast: composition, overlaps and coordination checks (structure graph and distance matrix),
+# standard: adds the graph hashes, the symmetry hash and the checks on the connectivity,
+# full: adds the external tools (zeo++ and EqEq)
+PROFILES: Dict[str, List[str]] = {
+    "fast": [descriptor for descriptor in DESCRIPTORS if descriptor in _FAST],
+    "standard": [descriptor for descriptor in DESCRIPTORS if descriptor in _STANDARD],
+    "full": list(DESCRIPTORS),
+}
+
+# wall-clock times on one CPU core, measured with `defer_symmetrization=True`
+# on CIF files from the test suite (AHOKIR: 14 atoms, ABAVIJ: 108 atoms,
+# ALUJOH: 300 atoms in the primitive cell); costs grow faster than linear with the size
+PROFILE_COSTS: Dict[str, str] = {
+    "fast": "~0.05 s (14 atoms), ~1 s (108 atoms), ~6 s (300 atoms)",
+    "standard": "~0.25 s (14 atoms), ~2.5 s (108 atoms), ~12 s (300 atoms)",
+    "full": "standard plus the run times of zeo++ and EqEq",
+}
+
+
+def get_profile(name: str) -> List[str]:
+    """Return the descriptors of a profile.
+
+    Args:
+        name (str): Name of the profile, `fast`, `standard` or `full`.
+
+    Raises:
+        ValueError: If the profile is unknown.
+
+    Returns:
+        List[str]: Names of the descriptors, in the order of `DESCRIPTORS`.
+    """
+    try:
+        return list(PROFILES[name])
+    except KeyError:
+        raise ValueError(f"Unknown profile {name}, use one of {', '.join(PROFILES)}") from None
+
+
+def plan_artifacts(descriptors: Iterable[str]) -> List[str]:
+    """Return the artifacts that are needed to compute the descriptors.
+
+    Args:
+        descriptors (Iterable[str]): Names of the descriptors.
+            Properties that are not in `DESCRIPTORS` do not add artifacts.
+
+    Returns:
+        List[str]: Artifacts in the order in which they should be built.
+    """
+    needed = set()
+    for descriptor in descriptors:
+        needed.update(DESCRIPTOR_DEPENDENCIES.get(descriptor, ()))
+    return [artifact for artifact in ARTIFACTS if artifact in needed]
@@ -4,3 +4,16 @@
 
 class NoMetal(KeyError):
     """Error in case there is no metal in structure."""
+
+
+class PrescreenFailed(ValueError):
+    """Error in case a structure fails the pre-screen."""
+
+    def __init__(self, failed):
+        """Create the error.
+
+        Args:
+            failed (List[str]): Names of the failed pre-screen checks.
+        """
+        self.failed = list(failed)
+        super().__init__(f"The structure failed the pre-screen: {', '.join(self.failed)}")
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Construction of the structure graph (bonds) of a structure."""
+from .adjacency import PeriodicAdjacency
+from .bonding import (
+    NATIVE_METHODS,
+    NeighborList,
+    get_cutoff_matrix,
+    get_largest_cutoff,
+    get_structure_graph,
+    vesta_bonds,
+)
+from .components import PeriodicComponents
+
+__all__ = [
+    "NATIVE_METHODS",
+    "NeighborList",
+    "PeriodicAdjacency",
+    "PeriodicComponents",
+    "get_cutoff_matrix",
+    "get_largest_cutoff",
+    "get_structure_graph",
+    "vesta_bonds",
+]
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Compact (CSR) representation of the bonds of a periodic structure graph.
+
+:py:meth:`~pymatgen.analysis.graphs.StructureGraph.get_connected_sites` creates
+new `ConnectedSite` and `PeriodicSite` objects for every neighbor in every call.
+Checks that only need the indices (or the number) of the neighbors of many
+sites can read them from a :py:class:`PeriodicAdjacency` instead, which is
+built once per structure graph.
+"""
+from typing import NamedTuple
+
+import numpy as np
+from pymatgen.analysis.graphs import StructureGraph
+
+__all__ = ["PeriodicAdjacency"]
+
+
+class PeriodicAdjacency(NamedTuple):
+    """Neighbors of all sites in compressed sparse row (CSR) form.
+
+    The neighbors of site `i` are `indices[indptr[i]:indptr[i + 1]]`,
+    with the images `images[indptr[i]:indptr[i + 1]]` (relative to site `i`)
+    and the bond lengths `distances[indptr[i]:indptr[i + 1]]`.
+    Like in :py:meth:`~pymatgen.analysis.graphs.StructureGraph.get_connected_sites`,
+    every bond appears in the rows of both sites, every (neighbor, image)
+    appears once per row, and the neighbors of a site are sorted by distance.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    images: np.ndarray
+    distances: np.ndarray
+
+    @classmethod
+    def from_structure_graph(cls, structure_graph: StructureGraph) -> "PeriodicAdjacency":
+        """Collect the bonds of a structure graph.
+
+        Args:
+            structure_graph (StructureGraph): The structure graph.
+
+        Returns:
+            PeriodicAdjacency: The neighbors of all sites of the structure graph.
+        """
+        structure = structure_graph.structure
+        edges = list(structure_graph.graph.edges(data="to_jimage"))
+        from_index = np.array([edge[0] for edge in edges], dtype=int)
+        to_index = np.array([edge[1] for edge in edges], dtype=int)
+        images = np.array([edge[2] for edge in edges], dtype=int).reshape(-1, 3)
+
+        # both directions, a bond seen from the second site goes to the opposite image
+        rows = np.concatenate([from_index, to_index])
+        columns = np.concatenate([to_index, from_index])
+        images = np.concatenate([images, -images])
+        entries = np.unique(np.column_stack([rows, columns, images]), axis=0)
+        rows, columns, images = entries[:, 0], entries[:, 1], entries[:, 2:]
+
+        frac_coords = structure.frac_coords
+        distances = np.linalg.norm(
+            structure.lattice.get_cartesian_coords(
+                frac_coords[columns] + images - frac_coords[rows]
+            ).reshape(-1, 3),
+            axis=1,
+        )
+        order = np.lexsort((distances, rows))
+        indptr = np.zeros(len(structure) + 1, dtype=int)
+        np.cumsum(np.bincount(rows, minlength=len(structure)), out=indptr[1:])
+        # bonds to images more than 127 cells away do not occur with bond-length cutoffs
+        return cls(indptr, columns[order], images[order].astype(np.int8), distances[order])
+
+    @property
+    def coordination_numbers(self) -> np.ndarray:
+        """Return the number of neighbors of every site."""
+        return np.diff(self.indptr)
+
+    def get_cn(self, index: int) -> int:
+        """Return the number of neighbors of a site."""
+        return int(self.indptr[index + 1] - self.indptr[index])
+
+    def get_neighbors(self, index: int) -> np.ndarray:
+        """Return the indices of the neighbors of a site, sorted by distance."""
+        return self.indices[self.indptr[index] : self.indptr[index + 1]]
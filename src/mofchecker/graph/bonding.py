@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Vectorized construction of structure graphs with element-pair cutoffs.
+
+`structuregraph_helpers.create.get_structure_graph(structure, "vesta")` queries
+the neighbors of every site separately (in Python). Here, all pairs within the
+largest cutoff are found with one neighbor-list search over the whole cell,
+the cutoffs of the element pairs are applied as one mask, and the edges
+(with their periodic images) are added to the graph in one pass.
+
+Since a cutoff method only filters the pairs of the neighbor search,
+one :py:class:`NeighborList` up to the largest cutoff can be shared
+by several methods and tolerances. Only methods that are not based on
+cutoffs (e.g., `voronoi`) use structuregraph_helpers.
+"""
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from pymatgen.analysis.graphs import StructureGraph
+from pymatgen.analysis.molecule_structure_comparator import CovalentRadius
+from pymatgen.core.periodic_table import get_el_sp
+from structuregraph_helpers.create import VestaCutoffDictNN
+from structuregraph_helpers.create import get_structure_graph as _get_helpers_structure_graph
+
+from ..types import StructureIStructureType
+
+__all__ = [
+    "NATIVE_METHODS",
+    "NeighborList",
+    "get_cutoff_matrix",
+    "get_largest_cutoff",
+    "get_structure_graph",
+    "vesta_bonds",
+]
+
+
+def _cutoff_matrix(names: np.ndarray, cut_off_dict: Dict[Tuple[str, str], float]) -> np.ndarray:
+    # same lookup as in pymatgen's CutOffDictNN (later entries win, pairs are symmetric)
+    lookup = defaultdict(dict)
+    for (species_1, species_2), cutoff in cut_off_dict.items():
+        lookup[species_1][species_2] = cutoff
+        lookup[species_2][species_1] = cutoff
+    return np.array(
+        [[lookup[name_1].get(name_2, 0.0) for name_2 in names] for name_1 in names]
+    ).reshape(len(names), len(names))
+
+
+def _vesta_cutoffs(names: np.ndarray) -> np.ndarray:
+    return _cutoff_matrix(names, VestaCutoffDictNN.cut_off_dict)
+
+
+_ISOTOPES = {"D": "H", "T": "H"}
+
+
+def _covalent_radius_cutoffs(names: np.ndarray) -> np.ndarray:
+    radii = []
+    for name in names:
+        symbol = get_el_sp(name).symbol
+        # deuterium and tritium have the radius of hydrogen
+        symbol = _ISOTOPES.get(symbol, symbol)
+        if symbol not in CovalentRadius.radius:
+            raise NotImplementedError(f"There is no covalent radius for {symbol}")
+        radii.append(CovalentRadius.radius[symbol])
+    radii = np.array(radii)
+    return radii[:, None] + radii[None, :]
+
+
+# bonding methods that are implemented here: cutoffs for the pairs of species
+# and the default tolerance. All other methods use structuregraph_helpers.
+# vesta: the tuned VESTA cutoffs of structuregraph_helpers (the same graph as its `vesta`),
+# fast_vesta: alias of vesta,
+# covalent_radius: sum of the covalent radii of Cordero et al.
+NATIVE_METHODS: Dict[str, Tuple[Callable[[np.ndarray], np.ndarray], float]] = {
+    "vesta": (_vesta_cutoffs, 0.0),
+    "fast_vesta": (_vesta_cutoffs, 0.0),
+    "covalent_radius": (_covalent_radius_cutoffs, 0.15),
+}
+
+
+class NeighborList(NamedTuple):
+    """All pairs of sites that are closer than a radius, sorted by the first site."""
+
+    radius: float
+    centers: np.ndarray
+    points: np.ndarray
+    images: np.ndarray
+    distances: np.ndarray
+
+    @classmethod
+    def from_structure(cls, structure: StructureIStructureType, radius: float) -> "NeighborList":
+        """Find all pairs with one neighbor search over the whole cell.
+
+        Args:
+            structure (StructureIStructureType): The structure.
+            radius (float): The largest distance of a pair.
+
+        Returns:
+            NeighborList: The pairs, every pair appears once for each of its sites.
+        """
+        if len(structure) == 0 or radius <= 0:
+            return cls(
+                radius, np.zeros(0, int), np.zeros(0, int), np.zeros((0, 3), int), np.zeros(0)
+            )
+        centers, points, images, distances = structure.get_neighbor_list(radius)
+        # the StructureGraph adds the bonds site by site
+        order = np.argsort(centers, kind="stable")
+        return cls(
+            radius,
+            centers[order],
+            points[order],
+            np.rint(images[order]).astype(int),
+            distances[order],
+        )
+
+
+def _get_species_types(structure: StructureIStructureType) -> Tuple[np.ndarray, np.ndarray]:
+    names, types = np.unique([site.species_string for site in structure], return_inverse=True)
+    return names, types.astype(int)
+
+
+def get_cutoff_matrix(
+    structure: StructureIStructureType, method: str, tolerance: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the bond-length cutoffs of a native bonding method.
+
+    Args:
+        structure (StructureIStructureType): The structure.
+        method (str): Name of the method, one of `NATIVE_METHODS`.
+        tolerance (float, optional): The cutoffs are scaled with `1 + tolerance`.
+            Defaults to None, i.e., the default tolerance of the method.
+
+    Raises:
+        ValueError: If the method is not a native method.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Species type of every site and
+            the cutoffs for all pairs of species types.
+    """
+    try:
+        get_cutoffs, default_tolerance = NATIVE_METHODS[method.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown bonding method {method}, use one of {', '.join(NATIVE_METHODS)}"
+        ) from None
+    names, types = _get_species_types(structure)
+    tolerance = default_tolerance if tolerance is None else tolerance
+    return types, get_cutoffs(names) * (1 + tolerance)
+
+
+def get_largest_cutoff(
+    structure: StructureIStructureType, methods: Iterable[Tuple[str, Optional[float]]]
+) -> float:
+    """Return the radius of a neighbor search that finds the bonds of several methods.
+
+    Args:
+        structure (StructureIStructureType): The structure.
+        methods (Iterable[Tuple[str, Optional[float]]]): Pairs of bonding method
+            and tolerance, methods that are not native are ignored.
+
+    Returns:
+        float: The largest cutoff of the methods.
+    """
+    return max(
+        (
+            get_cutoff_matrix(structure, method, tolerance)[1].max(initial=0.0)
+            for method, tolerance in methods
+            if method.lower() in NATIVE_METHODS
+        ),
+        default=0.0,
+    )
+
+
+def _get_bonds(
+    neighbor_list: NeighborList, types: np.ndarray, cutoffs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    if cutoffs.max(initial=0.0) > neighbor_list.radius:
+        raise ValueError(
+            f"The neighbor list (up to {neighbor_list.radius}) does not contain "
+            f"all pairs up to the largest cutoff {cutoffs.max()}"
+        )
+    bonded = (
+        neighbor_list.distances < cutoffs[types[neighbor_list.centers], types[neighbor_list.points]]
+    )
+    centers = neighbor_list.centers[bonded]
+    points = neighbor_list.points[bonded]
+    images = neighbor_list.images[bonded]
+
+    # orientation of StructureGraph.add_edge: from the lower index, with the image of the other
+    swap = points < centers
+    from_index = np.where(swap, points, centers)
+    to_index = np.where(swap, centers, points)
+    images = np.where(swap[:, None], -images, images)
+    # bonds of a site to its own image: the first nonzero component of the image is positive
+    first_nonzero = images[np.arange(len(images)), np.argmax(images != 0, axis=1)]
+    images[(from_index == to_index) & (first_nonzero < 0)] *= -1
+
+    # every bond is found from both sites, keep the first one
+    bonds = np.column_stack([from_index, to_index])
+    _, first = np.unique(np.column_stack([bonds, images]), axis=0, return_index=True)
+    first.sort()
+    return bonds[first], images[first]
+
+
+def vesta_bonds(
+    structure: StructureIStructureType,
+    cut_off_dict: Optional[Dict[Tuple[str, str], float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the bonds of a structure with element-pair cutoffs.
+
+    The bonds are the ones that
+    :py:class:`~pymatgen.analysis.local_env.CutOffDictNN`
+    adds to a :py:class:`~pymatgen.analysis.graphs.StructureGraph`, i.e., every bond
+    appears once, from the lower to the higher site index, with the image of the
+    second site. The bonds are sorted by the first site in which they are found;
+    the order of the bonds of one site follows the neighbor search and can
+    differ from the one of pymatgen.
+
+    Args:
+        structure (StructureIStructureType): The structure.
+        cut_off_dict (Dict[Tuple[str, str], float], optional): Maximum bond length
+            per pair of species. Defaults to None, i.e., the tuned VESTA cutoffs
+            of structuregraph_helpers.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Site indices of the bonds, shape (n, 2),
+            and images of the second sites, shape (n, 3).
+    """
+    if cut_off_dict is None:
+        cut_off_dict = VestaCutoffDictNN.cut_off_dict
+    names, types = _get_species_types(structure)
+    cutoffs = _cutoff_matrix(names, cut_off_dict)
+    neighbor_list = NeighborList.from_structure(structure, cutoffs.max(initial=0.0))
+    return _get_bonds(neighbor_list, types, cutoffs)
+
+
+def get_structure_graph(
+    structure: StructureIStructureType,
+    method: str = "vesta",
+    tolerance: Optional[float] = None,
+    neighbor_list: Optional[NeighborList] = None,
+) -> StructureGraph:
+    """Get the structure graph of a structure.
+
+    Args:
+        structure (StructureIStructureType): The structure.
+        method (str): Bonding method. The methods in `NATIVE_METHODS` use
+            one vectorized neighbor search (`vesta` and its alias `fast_vesta` build the
+            same graph as the `vesta` method of structuregraph_helpers), all other methods
+            (e.g., `voronoi`) are passed to
+            `structuregraph_helpers.create.get_structure_graph`. Defaults to `vesta`.
+        tolerance (float, optional): Relative tolerance of the cutoffs of a native method.
+            Defaults to None, i.e., the default tolerance of the method.
+        neighbor_list (NeighborList, optional): Pairs of the structure up to (at least)
+            the largest cutoff of a native method, e.g., to share one neighbor search
+            between several methods. Defaults to None, i.e., a new search.
+
+    Raises:
+        ValueError: If a tolerance is given for a method of structuregraph_helpers.
+
+    Returns:
+        StructureGraph: The structure graph, with the site index as `idx` node attribute.
+    """
+    if method.lower() not in NATIVE_METHODS:
+        if tolerance is not None:
+            raise ValueError(f"The bonding method {method} does not support a tolerance")
+        return _get_helpers_structure_graph(structure, method)
+
+    types, cutoffs = get_cutoff_matrix(structure, method, tolerance)
+    if neighbor_list is None:
+        neighbor_list = NeighborList.from_structure(structure, cutoffs.max(initial=0.0))
+    bonds, images = _get_bonds(neighbor_list, types, cutoffs)
+
+    structure_graph = StructureGraph.with_empty_graph(structure, name="bonds")
+    structure_graph.graph.add_edges_from(
+        (from_index, to_index, {"to_jimage": image})
+        for (from_index, to_index), image in zip(bonds.tolist(), map(tuple, images.tolist()))
+    )
+    nx.set_node_attributes(
+        structure_graph.graph, name="idx", values={index: index for index in range(len(structure))}
+    )
+    return structure_graph
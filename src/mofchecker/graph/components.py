@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Connected components of a periodic structure graph and their dimensionality.
+
+The components are found with one breadth-first search over the bonds of the
+unit cell (the quotient graph), without building a supercell. Every site gets
+the image ("voltage") through which the search reached it. A bond that closes
+a cycle then has the net image `voltage[u] + image - voltage[v]`, and the
+dimensionality of a component is the rank of the net images of its cycles
+(0 for molecules, 1 for chains, 2 for layers and 3 for frameworks), see
+P. M. Larsen et al., Phys. Rev. Materials 3, 034003 (2019).
+"""
+from typing import List, NamedTuple
+
+import numpy as np
+
+from .adjacency import PeriodicAdjacency
+
+__all__ = ["PeriodicComponents"]
+
+
+class PeriodicComponents(NamedTuple):
+    """Connected components of a periodic structure graph.
+
+    The components are numbered in the order of their lowest site index.
+    """
+
+    labels: np.ndarray
+    dimensionalities: List[int]
+
+    @classmethod
+    def from_adjacency(cls, adjacency: PeriodicAdjacency) -> "PeriodicComponents":
+        """Find the components and their dimensionality.
+
+        Args:
+            adjacency (PeriodicAdjacency): The bonds of the structure.
+
+        Returns:
+            PeriodicComponents: Component of every site and dimensionality of every component.
+        """
+        indptr = adjacency.indptr.tolist()
+        indices = adjacency.indices.tolist()
+        images = [tuple(image) for image in adjacency.images.tolist()]
+        labels = [-1] * (len(indptr) - 1)
+        voltages = [None] * len(labels)
+        dimensionalities = []
+
+        for root, root_label in enumerate(labels):
+            if root_label >= 0:
+                continue
+            label = len(dimensionalities)
+            labels[root] = label
+            voltages[root] = (0, 0, 0)
+            queue = [root]
+            cycles = []
+            for site in queue:
+                voltage_a, voltage_b, voltage_c = voltages[site]
+                for entry in range(indptr[site], indptr[site + 1]):
+                    neighbor = indices[entry]
+                    image_a, image_b, image_c = images[entry]
+                    voltage = (voltage_a + image_a, voltage_b + image_b, voltage_c + image_c)
+                    if labels[neighbor] < 0:
+                        labels[neighbor] = label
+                        voltages[neighbor] = voltage
+                        queue.append(neighbor)
+                    elif voltage != voltages[neighbor]:
+                        cycles.append(np.subtract(voltage, voltages[neighbor]))
+            dimensionalities.append(int(np.linalg.matrix_rank(cycles)) if cycles else 0)
+
+        return cls(np.array(labels, dtype=int), dimensionalities)
+
+    @property
+    def components(self) -> List[List[int]]:
+        """Return the site indices of every component (in ascending order)."""
+        order = np.argsort(self.labels, kind="stable")
+        boundaries = np.cumsum(np.bincount(self.labels, minlength=len(self.dimensionalities)))
+        return [part.tolist() for part in np.split(order, boundaries[:-1])]
+
+    @property
+    def dimensionality(self) -> int:
+        """Return the highest dimensionality of all components."""
+        return max(self.dimensionalities, default=0)
+
+    def get_floating_components(self) -> List[List[int]]:
+        """Return the site indices of the components that are not periodic (molecules)."""
+        return [
+            component
+            for component, dimensionality in zip(self.components, self.dimensionalities)
+            if dimensionality == 0
+        ]
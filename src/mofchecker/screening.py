@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Pre-screen of structures with checks that do not need a structure graph.
+
+The pre-screen runs on the structure as it was read, i.e., before
+the symmetry analysis, the primitive reduction and the construction of the
+structure graph, such that obviously broken structures can be dropped cheaply.
+"""
+from typing import List, Tuple
+
+from .checks.global_structure import HasCarbon, HasHydrogen, HasMetal
+from .checks.local_structure import AtomicOverlapCheck
+from .types import StructureIStructureType
+from .utils import _check_if_ordered
+
+__all__ = ["PRESCREEN_CHECKS", "prescreen"]
+
+# in the order in which they run, the names are the ones of MOFChecker.checks
+PRESCREEN_CHECKS = ("is_ordered", "has_c", "has_h", "has_metal", "no_atomic_overlaps")
+
+_PRESCREEN_FACTORIES = {
+    "has_c": HasCarbon,
+    "has_h": HasHydrogen,
+    "has_metal": HasMetal,
+    "no_atomic_overlaps": AtomicOverlapCheck,
+}
+
+
+def prescreen(structure: StructureIStructureType, fail_fast: bool = True) -> Tuple[bool, List[str]]:
+    """Run the checks that only need the raw structure.
+
+    `is_ordered` fails for structures with partial occupancies or elements that
+    pymatgen does not support, the other checks are not run for such structures.
+
+    Args:
+        structure (StructureIStructureType): The structure as it was read.
+        fail_fast (bool): Stop at the first failed check. Defaults to True.
+
+    Returns:
+        Tuple[bool, List[str]]: True if all checks passed, and the names of the
+            failed checks (see `PRESCREEN_CHECKS`).
+    """
+    try:
+        _check_if_ordered(structure)
+    except NotImplementedError:
+        return False, ["is_ordered"]
+
+    failed = []
+    for name, check_class in _PRESCREEN_FACTORIES.items():
+        if not check_class(structure).is_ok:
+            failed.append(name)
+            if fail_fast:
+                break
+    return not failed, failed
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""Long-lived local HTTP service with warm worker processes.
+
+The service avoids the startup cost of every `mofchecker` call
+(importing pymatgen, networkx, ...): the worker processes import
+mofchecker once and then check the structures of many requests.
+Requests that arrive at the same time are combined into micro-batches,
+and requests are rejected (HTTP 503) if too many structures are queued.
+If the results of a request are not ready within the request timeout,
+the request fails (HTTP 504).
+
+Protocol:
+    `POST /check` with a JSON body
+    `{"structures": [{"cif": "<CIF text>"} or {"path": "<path on the server>"}, ...],
+    "descriptors": [...], "options": {"primitive": true}}`
+    returns `{"results": [<result row>, ...]}` with one result row
+    (see :py:func:`~mofchecker.batch.check_one`) per structure.
+    `GET /health` returns the number of workers and queued structures.
+
+`{"path": ...}` entries make the server read files with its own permissions.
+Hence, they are only accepted if the server listens on a loopback address
+(or paths are allowed explicitly), otherwise they are rejected (HTTP 403).
+"""
+import functools
+import ipaddress
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+from .batch import check_one
+from .batch.records import format_error, make_record
+from .utils import ignore_cif_warnings
+from .version import get_version
+
+__all__ = ["CheckService", "QueueFull", "is_loopback", "make_server", "serve"]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_REQUEST_TIMEOUT = 600.0
+OPTIONS = (
+    "primitive",
+    "symprec",
+    "angle_tolerance",
+    "defer_symmetrization",
+    "prescreen",
+    "background_tools",
+)
+
+
+class QueueFull(Exception):
+    """Raised if the service cannot accept more structures."""
+
+
+def _warm_up() -> None:
+    """Import mofchecker and initialize the lazily loaded data in a new worker."""
+    ignore_cif_warnings()
+    from pymatgen.core import Lattice, Structure  # pylint:disable=import-outside-toplevel
+
+    from . import MOFChecker  # pylint:disable=import-outside-toplevel
+
+    structure = Structure(
+        Lattice.cubic(10),
+        ["Cu", "O", "C", "H"],
+        [[0, 0, 0], [0.2, 0, 0], [0.33, 0, 0], [0.33, 0.1, 0]],
+    )
+    try:
+        MOFChecker(structure).get_mof_descriptors(["has_metal", "has_overcoordinated_c"])
+    except Exception:  # pylint:disable=broad-except
+        pass
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _check_entry(entry: dict, descriptors: Optional[List[str]], options: dict) -> OrderedDict:
+    if "path" in entry:
+        return check_one(entry["path"], descriptors, **options)
+
+    from pymatgen.core import Structure  # pylint:disable=import-outside-toplevel
+
+    try:
+        structure = Structure.from_str(entry["cif"], fmt="cif")
+    except Exception as exc:  # pylint:disable=broad-except
+        return make_record(0, None, "error", error=format_error(exc))
+    return check_one(structure, descriptors, **options)
+
+
+def _check_jobs(jobs: List[Tuple[dict, Optional[List[str]], dict]]) -> List[OrderedDict]:
+    return [_check_entry(entry, descriptors, options) for entry, descriptors, options in jobs]
+
+
+class _Job:  # pylint:disable=too-few-public-methods
+    __slots__ = ("entry", "descriptors", "options", "future")
+
+    def __init__(self, entry: dict, descriptors: Optional[List[str]], options: dict):
+        self.entry = entry
+        self.descriptors = descriptors
+        self.options = options
+        self.future = Future()
+
+
+class CheckService:
+    """Pool of warm worker processes that checks micro-batches of structures.
+
+    A dispatcher thread waits for a free worker and then sends it all queued
+    structures (up to `batch_size`), waiting at most `batch_wait` seconds
+    for more structures to arrive.
+    If a worker dies (e.g., killed by the OOM killer), its batch fails
+    and the workers are replaced.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: int = 256,
+        batch_size: int = 8,
+        batch_wait: float = 0.005,
+    ):
+        """Create the service, the workers are started with :py:meth:`start`.
+
+        Args:
+            workers (int, optional): Number of worker processes.
+                Defaults to None, i.e., the number of CPUs.
+            max_queue (int): Maximum number of queued and running structures.
+                Defaults to 256.
+            batch_size (int): Maximum number of structures sent to a worker at once.
+                Defaults to 8.
+            batch_wait (float): Time in seconds to wait for more structures
+                before a batch is sent. Defaults to 0.005.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        self._queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued and running structures."""
+        return self._depth
+
+    def start(self) -> None:
+        """Start and warm up all workers and the dispatcher."""
+        wait_futures([self._executor.submit(_ping) for _ in range(self.workers)])
+        self._dispatcher.start()
+
+    def close(self) -> None:
+        """Stop the dispatcher and the workers."""
+        self._queue.put(None)
+        if self._dispatcher.is_alive():
+            self._dispatcher.join()
+        self._executor.shutdown()
+
+    def submit(
+        self, entries: List[dict], descriptors: Optional[List[str]] = None, options: dict = None
+    ) -> List[Future]:
+        """Queue structures to be checked.
+
+        Args:
+            entries (List[dict]): Structures, either `{"cif": <CIF text>}`
+                or `{"path": <path>}`.
+            descriptors (List[str], optional): Descriptors to compute.
+                Defaults to None, i.e., all descriptors.
+            options (dict, optional): Passed to the
+                :py:class:`~mofchecker.MOFChecker` constructor. Defaults to None.
+
+        Raises:
+            QueueFull: If the structures would exceed the queue limit.
+
+        Returns:
+            List[Future]: One future per structure that resolves to its result row.
+        """
+        with self._lock:
+            if self._depth + len(entries) > self.max_queue:
+                raise QueueFull(
+                    f"{self._depth} structures are queued, the limit is {self.max_queue}"
+                )
+            self._depth += len(entries)
+        jobs = [_Job(entry, descriptors, options or {}) for entry in entries]
+        for job in jobs:
+            self._queue.put(job)
+        return [job.future for job in jobs]
+
+    def _next_batch(self, first: _Job) -> Tuple[List[_Job], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _dispatch(self) -> None:
+        stop = False
+        while not stop:
+            job = self._queue.get()
+            if job is None:
+                return
+            # wait for a free worker, meanwhile more structures can arrive
+            self._slots.acquire()  # pylint:disable=consider-using-with
+            batch, stop = self._next_batch(job)
+            future = self._submit([(job.entry, job.descriptors, job.options) for job in batch])
+            future.add_done_callback(functools.partial(self._finish, batch))
+
+    def _submit(self, jobs: List[Tuple[dict, Optional[List[str]], dict]]) -> Future:
+        try:
+            return self._executor.submit(_check_jobs, jobs)
+        except BrokenProcessPool:
+            # a worker died, the pool does not accept any further tasks
+            self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        try:
+            return self._executor.submit(_check_jobs, jobs)
+        except Exception as exc:  # pylint:disable=broad-except
+            future = Future()
+            future.set_exception(exc)
+            return future
+
+    def _finish(self, batch: List[_Job], future: Future) -> None:
+        self._slots.release()
+        try:
+            records = future.result()
+        except Exception as exc:  # pylint:disable=broad-except
+            records = [make_record(0, None, "error", error=format_error(exc)) for _ in batch]
+        with self._lock:
+            self._depth -= len(batch)
+        for job, record in zip(batch, records):
+            job.future.set_result(record)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = f"mofchecker/{get_version()}"
+
+    def _send_json(self, status: int, content: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        """Report the state of the service."""
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        service = self.server.service
+        self._send_json(
+            200,
+            {
+                "status": "ok",
+                "version": get_version(),
+                "workers": service.workers,
+                "queue": service.depth,
+                "max_queue": service.max_queue,
+            },
+        )
+
+    def do_POST(self):  # noqa: N802
+        """Check the structures in the request."""
+        if self.path != "/check":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            entries, descriptors, options = _parse_request(request)
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+
+        if not self.server.allow_paths and any("path" in entry for entry in entries):
+            self._send_json(
+                403, {"error": "This server does not read paths, send the CIF content instead"}
+            )
+            return
+
+        try:
+            futures = self.server.service.submit(entries, descriptors, options)
+        except QueueFull as exc:
+            self._send_json(503, {"error": str(exc)}, {"Retry-After": "1"})
+            return
+
+        deadline = time.monotonic() + self.server.request_timeout
+        results = []
+        for index, (entry, future) in enumerate(zip(entries, futures)):
+            try:
+                record = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                self._send_json(
+                    504,
+                    {"error": f"The request took longer than {self.server.request_timeout} s"},
+                )
+                return
+            record["index"] = index
+            record["input"] = entry.get("path")
+            results.append(record)
+        self._send_json(200, {"results": results})
+
+    def log_message(self, format, *args):  # pylint:disable=redefined-builtin
+        """Only log if the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _parse_request(request: dict) -> Tuple[List[dict], Optional[List[str]], dict]:
+    from . import DESCRIPTORS  # pylint:disable=import-outside-toplevel
+
+    if not isinstance(request, dict) or not isinstance(request.get("structures"), list):
+        raise ValueError("The request must contain a list of structures")
+    entries = request["structures"]
+    for entry in entries:
+        if not isinstance(entry, dict) or not ({"cif", "path"} & set(entry)):
+            raise ValueError("Every structure must have a cif or a path key")
+
+    descriptors = request.get("descriptors")
+    if descriptors is not None:
+        if not isinstance(descriptors, list) or not all(
+            isinstance(name, str) for name in descriptors
+        ):
+            raise ValueError("The descriptors must be a list of names")
+        unknown = set(descriptors) - set(DESCRIPTORS)
+        if unknown:
+            raise ValueError(f"Unknown descriptors {sorted(unknown)}")
+
+    options = request.get("options") or {}
+    unknown = set(options) - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown options {sorted(unknown)}, supported are {list(OPTIONS)}")
+    return entries, descriptors, options
+
+
+def is_loopback(host: str) -> bool:
+    """Return True if `host` is a loopback address (or `localhost`)."""
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # a host name (or an empty string, i.e., all interfaces)
+        return False
+
+
+def make_server(
+    service: CheckService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    verbose: bool = False,
+    allow_paths: Optional[bool] = None,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+) -> ThreadingHTTPServer:
+    """Create an HTTP server that sends the structures to a started service.
+
+    Args:
+        service (CheckService): The service that checks the structures.
+        host (str): Address to listen on. Defaults to 127.0.0.1.
+        port (int): Port to listen on, 0 selects a free port. Defaults to 8765.
+        verbose (bool): Log every request. Defaults to False.
+        allow_paths (bool, optional): Accept `{"path": ...}` entries, i.e., let clients
+            make the server read any file it can read. Defaults to None, i.e.,
+            only if the server listens on a loopback address.
+        request_timeout (float): Time in seconds after which a request fails
+            (HTTP 504) if its results are not ready. Defaults to 600.
+
+    Returns:
+        ThreadingHTTPServer: The server, call `serve_forever` to handle requests.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    server.allow_paths = is_loopback(host) if allow_paths is None else allow_paths
+    server.request_timeout = request_timeout
+    return server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: Optional[int] = None,
+    max_queue: int = 256,
+    batch_size: int = 8,
+    batch_wait: float = 0.005,
+    verbose: bool = False,
+    allow_paths: Optional[bool] = None,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+) -> None:
+    """Run the service until it is interrupted.
+
+    Args:
+        host (str): Address to listen on. Defaults to 127.0.0.1.
+        port (int): Port to listen on. Defaults to 8765.
+        workers (int, optional): Number of worker processes.
+            Defaults to None, i.e., the number of CPUs.
+        max_queue (int): Maximum number of queued and running structures.
+            Defaults to 256.
+        batch_size (int): Maximum number of structures sent to a worker at once.
+            Defaults to 8.
+        batch_wait (float): Time in seconds to wait for more structures
+            before a batch is sent. Defaults to 0.005.
+        verbose (bool): Log every request. Defaults to False.
+        allow_paths (bool, optional): Accept `{"path": ...}` entries. Defaults to None,
+            i.e., only if the server listens on a loopback address.
+        request_timeout (float): Time in seconds after which a request fails
+            (HTTP 504) if its results are not ready. Defaults to 600.
+    """
+    service = CheckService(workers, max_queue, batch_size, batch_wait)
+    service.start()
+    server = make_server(service, host, port, verbose, allow_paths, request_timeout)
+    if threading.current_thread() is threading.main_thread():
+        # shut down cleanly when stopped by a service manager
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
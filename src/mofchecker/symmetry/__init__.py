@@ -1,28 +1,35 @@
 # -*- coding: utf-8 -*-
 """Analyze symmetrized structures and hash them."""
-import functools
 from typing import Union
 
 from pymatgen.core import IStructure
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from pymatgen.symmetry.structure import SymmetrizedStructure
 
-from .hash import hash_symmetrized_structure
+from .dataset import ANGLE_TOLERANCE, SYMPREC, SymmetryDataset, get_symmetry_dataset
+from .hash import hash_wyckoff_letters
 
 
-@functools.lru_cache(maxsize=2, typed=False)
-def get_symmetrized_structure(structure: IStructure) -> SymmetrizedStructure:
+def get_symmetrized_structure(
+    structure: IStructure, symprec: float = SYMPREC, angle_tolerance: float = ANGLE_TOLERANCE
+) -> SymmetrizedStructure:
     """Construct a SymmetrizedStructure.
 
     That is. a structure where the spacegroup and symmetry operations are defined.
+    The result is not cached, :py:meth:`~mofchecker.MOFChecker.get_symmetrized_structure`
+    keeps the symmetrized structures of a MOFChecker instance.
 
     Args:
         structure (IStructure): structure to symmetrize
+        symprec (float): Symmetry precision. Defaults to 0.01.
+        angle_tolerance (float): Angle tolerance. Defaults to 5.
 
     Returns:
         SymmetrizedStructure: symmetrized structure
     """
-    return SpacegroupAnalyzer(structure).get_symmetrized_structure()
+    return SpacegroupAnalyzer(
+        structure, symprec=symprec, angle_tolerance=angle_tolerance
+    ).get_symmetrized_structure()
 
 
 def symmetrize_if_not_symmetrized(
@@ -34,17 +41,30 @@ def symmetrize_if_not_symmetrized(
     return structure
 
 
-def get_spacegroup_symbol_and_number(structure: Union[IStructure, SymmetrizedStructure]) -> dict:
-    """Return a dict with spacegroup symbol and number."""
-    structure = symmetrize_if_not_symmetrized(structure)
-    return {
-        "symbol": structure.spacegroup.int_symbol,
-        "number": structure.spacegroup.int_number,
-    }
+def _get_dataset(
+    structure: Union[IStructure, SymmetrizedStructure, SymmetryDataset]
+) -> SymmetryDataset:
+    if isinstance(structure, SymmetryDataset):
+        return structure
+    if isinstance(structure, SymmetrizedStructure):
+        return SymmetryDataset.from_symmetrized_structure(structure)
+    return get_symmetry_dataset(structure, SYMPREC, ANGLE_TOLERANCE)
+
+
+def get_spacegroup_symbol_and_number(
+    structure: Union[IStructure, SymmetrizedStructure, SymmetryDataset]
+) -> dict:
+    """Return a dict with spacegroup symbol and number.
+
+    For structures that are not symmetrized, spglib is called directly
+    (see :py:func:`~mofchecker.symmetry.dataset.get_symmetry_dataset`).
+    """
+    dataset = _get_dataset(structure)
+    return {"symbol": dataset.symbol, "number": dataset.number}
 
 
 def get_symmetry_hash(
-    structure: Union[IStructure, SymmetrizedStructure], tight: bool = False
+    structure: Union[IStructure, SymmetrizedStructure, SymmetryDataset], tight: bool = False
 ) -> str:
     """Hashes the symmetrical positions of the SymmetrizedStructure.
 
@@ -52,13 +72,17 @@ def get_symmetry_hash(
     otherwise only the number and identity
     of the elements is considered.
 
+    For structures that are not symmetrized, spglib is called directly
+    (see :py:func:`~mofchecker.symmetry.dataset.get_symmetry_dataset`).
+
     Args:
-        structure (Union[Structure, IStructure, SymmetrizedStructure]):
-            A structure for which the symmetry hash is calculated
+        structure (Union[Structure, IStructure, SymmetrizedStructure, SymmetryDataset]):
+            A structure for which the symmetry hash is calculated,
+            or its symmetry dataset
         tight (bool): If True, also consider the ordering. Defaults to False.
 
     Returns:
         str: hash
     """
-    structure = symmetrize_if_not_symmetrized(structure)
-    return hash_symmetrized_structure(structure, tight)
+    dataset = _get_dataset(structure)
+    return hash_wyckoff_letters(dataset.wyckoff_letters, dataset.number, tight)
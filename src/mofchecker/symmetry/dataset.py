@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Spacegroup and Wyckoff letters computed with spglib from the raw arrays of a structure.
+
+This avoids building a pymatgen `SymmetrizedStructure` (with the symmetry operations,
+new site objects and the grouping of equivalent sites) if only the spacegroup
+and the Wyckoff letters are needed, e.g., for the symmetry hash.
+"""
+from typing import List, NamedTuple
+
+import numpy as np
+import spglib
+from pymatgen.symmetry.structure import SymmetrizedStructure
+
+from ..types import StructureIStructureType
+
+__all__ = ["ANGLE_TOLERANCE", "SYMPREC", "SymmetryDataset", "get_symmetry_dataset"]
+
+# tolerances of the symmetry descriptors (the defaults of pymatgen)
+SYMPREC = 0.01
+ANGLE_TOLERANCE = 5
+
+
+class SymmetryDataset(NamedTuple):
+    """Spacegroup and Wyckoff letters of a structure."""
+
+    number: int
+    symbol: str
+    wyckoff_letters: List[str]
+
+    @classmethod
+    def from_symmetrized_structure(cls, structure: SymmetrizedStructure) -> "SymmetryDataset":
+        """Take the dataset from a symmetrized structure, e.g., to reuse an analysis."""
+        return cls(
+            structure.spacegroup.int_number,
+            structure.spacegroup.int_symbol,
+            list(structure.wyckoff_letters),
+        )
+
+
+def _get(dataset, key: str):
+    # spglib >= 2.5 returns an object, older versions a dict
+    return dataset[key] if isinstance(dataset, dict) else getattr(dataset, key)
+
+
+def get_symmetry_dataset(
+    structure: StructureIStructureType,
+    symprec: float = SYMPREC,
+    angle_tolerance: float = ANGLE_TOLERANCE,
+) -> SymmetryDataset:
+    """Run spglib on the lattice, fractional coordinates and species of a structure.
+
+    Like in :py:class:`~pymatgen.symmetry.analyzer.SpacegroupAnalyzer`,
+    sites with different species (e.g., oxidation states) are different atom types.
+    Magnetic moments are not considered.
+
+    Args:
+        structure (StructureIStructureType): Structure to analyze.
+        symprec (float): Symmetry precision. Defaults to 0.01.
+        angle_tolerance (float): Angle tolerance. Defaults to 5.
+
+    Raises:
+        ValueError: If spglib cannot determine the symmetry.
+
+    Returns:
+        SymmetryDataset: Spacegroup number and symbol and the Wyckoff letter of every site.
+    """
+    types = {}
+    numbers = [types.setdefault(site.species, len(types) + 1) for site in structure]
+    cell = (structure.lattice.matrix, structure.frac_coords, np.array(numbers))
+    dataset = spglib.get_symmetry_dataset(cell, symprec=symprec, angle_tolerance=angle_tolerance)
+    if dataset is None:
+        raise ValueError(f"spglib could not determine the symmetry: {spglib.get_error_message()}")
+    return SymmetryDataset(
+        int(_get(dataset, "number")),
+        str(_get(dataset, "international")),
+        [str(letter) for letter in _get(dataset, "wyckoffs")],
+    )
@@ -3,6 +3,7 @@
 import base64
 import hashlib
 from collections import Counter
+from typing import Sequence
 
 from pymatgen.symmetry.structure import SymmetrizedStructure
 
@@ -33,11 +34,26 @@ def hash_symmetrized_structure(
     Returns:
         str: hash
     """
-    if tight:
-        return "".join(symmetrized_structure.wyckoff_letters) + str(
-            symmetrized_structure.spacegroup.int_number
-        )
-    wyckoff_letter_counts = tuple(set(symmetrized_structure.wyckoff_letters))
-    return make_sha256_hash(wyckoff_letter_counts) + str(
-        symmetrized_structure.spacegroup.int_number
+    return hash_wyckoff_letters(
+        symmetrized_structure.wyckoff_letters, symmetrized_structure.spacegroup.int_number, tight
     )
+
+
+def hash_wyckoff_letters(
+    wyckoff_letters: Sequence[str], spacegroup_number: int, tight: bool = False
+) -> str:
+    """Hash the Wyckoff letters of the sites and the spacegroup number.
+
+    Args:
+        wyckoff_letters (Sequence[str]): Wyckoff letter of every site.
+        spacegroup_number (int): International spacegroup number.
+        tight (bool): If True, also consider the ordering
+            of the Wyckoff letters. Defaults to False.
+
+    Returns:
+        str: hash
+    """
+    if tight:
+        return "".join(wyckoff_letters) + str(spacegroup_number)
+    wyckoff_letter_counts = tuple(set(wyckoff_letters))
+    return make_sha256_hash(wyckoff_letter_counts) + str(spacegroup_number)
@@ -7,11 +7,46 @@ import warnings
 from types import FunctionType
 
 import pymatgen
-from backports.cached_property import cached_property
 
 from .types import PathType
 
 
+class cached_property:  # noqa: N801 pylint:disable=invalid-name,too-few-public-methods
+    """Property that is computed once and then stored in the instance.
+
+    Unlike `functools.cached_property` (before Python 3.12), it does not hold a lock
+    that is shared by all instances of a class, such that, e.g., the checks of
+    different structures can run at the same time in different threads.
+    If two threads compute the value at the same time, both get the value
+    that was stored first.
+    """
+
+    def __init__(self, func):
+        """Wrap the function that computes the value."""
+        self.func = func
+        self.attrname = None
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        """Remember the name under which the value is stored."""
+        self.attrname = name
+
+    def __get__(self, instance, owner=None):
+        """Compute the value and store it, later lookups find it in the instance."""
+        if instance is None:
+            return self
+        return instance.__dict__.setdefault(self.attrname, self.func(instance))
+
+
+def ignore_cif_warnings() -> None:
+    """Ignore the warnings of the pymatgen CIF parser, e.g., about rounded coordinates.
+
+    The filter is global and stays in place, hence it is only added
+    in the worker processes that mofchecker starts. Other warnings are not affected.
+    """
+    warnings.filterwarnings("ignore", category=UserWarning, module=r"pymatgen\.io\.cif")
+
+
 def deprecated(func: FunctionType) -> FunctionType:
     """Mark function as deprecated using a decorator.
 
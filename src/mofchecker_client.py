@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Lightweight client for `mofchecker serve`.
+
+This module only uses the standard library and does not import mofchecker,
+such that sending structures to a running service takes milliseconds.
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from typing import Iterable, List, Optional
+
+__all__ = ["check", "main"]
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+def check(
+    paths: Iterable[str],
+    url: str = DEFAULT_URL,
+    descriptors: Optional[List[str]] = None,
+    send_paths: bool = False,
+    options: Optional[dict] = None,
+    timeout: Optional[float] = None,
+) -> List[dict]:
+    """Send CIF files to a running `mofchecker serve` and return the result rows.
+
+    Args:
+        paths (Iterable[str]): Paths to CIF files.
+        url (str): URL of the service. Defaults to http://127.0.0.1:8765.
+        descriptors (List[str], optional): Descriptors to compute.
+            Defaults to None, i.e., all descriptors.
+        send_paths (bool): Send the (absolute) paths instead of the file content.
+            Only useful if the service runs on the same file system. Defaults to False.
+        options (dict, optional): Options for the MOFChecker constructor,
+            e.g., `{"primitive": False}`. Defaults to None.
+        timeout (float, optional): Timeout of the request in seconds. Defaults to None.
+
+    Raises:
+        RuntimeError: If the service rejects the request (e.g., because it is busy).
+
+    Returns:
+        List[dict]: One result row per file, with the keys `index`, `input`,
+            `status`, `error` and `descriptors`.
+    """
+    paths = list(paths)
+    structures = []
+    for path in paths:
+        if send_paths:
+            structures.append({"path": os.path.abspath(path)})
+        else:
+            with open(path, "r") as handle:
+                structures.append({"cif": handle.read()})
+    body = {"structures": structures, "descriptors": descriptors, "options": options or {}}
+    request = urllib.request.Request(
+        url.rstrip("/") + "/check",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+            results = json.loads(response.read())["results"]
+    except urllib.error.HTTPError as exc:
+        try:
+            message = json.loads(exc.read())["error"]
+        except (ValueError, KeyError):
+            message = exc.reason
+        raise RuntimeError(f"The service rejected the request ({exc.code}): {message}") from exc
+    for path, result in zip(paths, results):
+        result["input"] = path
+        if not send_paths and result["status"] == "ok" and "name" in result["descriptors"]:
+            # the service does not know the file name if the content was sent
+            result["descriptors"]["name"] = os.path.splitext(os.path.basename(path))[0]
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the client from the command line.
+
+    Args:
+        argv (List[str], optional): Command line arguments. Defaults to None, i.e., sys.argv.
+
+    Returns:
+        int: Exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="mofchecker-client", description="Check CIF files with a running `mofchecker serve`."
+    )
+    parser.add_argument("cif_files", nargs="+", metavar="CIF_FILES")
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL of the service.")
+    parser.add_argument(
+        "-d", "--descriptors", action="append", help="Select descriptors to be computed."
+    )
+    parser.add_argument(
+        "--paths",
+        action="store_true",
+        help="Send the paths instead of the file content (same file system only).",
+    )
+    parser.add_argument(
+        "--no-primitive",
+        action="store_true",
+        help="Do not perform the analysis on the primitive structure.",
+    )
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json")
+    args = parser.parse_args(argv)
+
+    try:
+        results = check(
+            args.cif_files,
+            url=args.url,
+            descriptors=args.descriptors,
+            send_paths=args.paths,
+            options={"primitive": not args.no_primitive},
+        )
+    except (OSError, RuntimeError) as exc:
+        print(f"mofchecker-client: {exc}", file=sys.stderr)  # noqa: T201
+        return 1
+
+    if args.format == "jsonl":
+        for result in results:
+            print(json.dumps(result, separators=(",", ":")))  # noqa: T201
+    else:
+        for result in results:
+            if result["status"] != "ok":
+                print(f"{result['input']}: {result['error']}", file=sys.stderr)  # noqa: T201
+        descriptors = [result["descriptors"] for result in results if result["status"] == "ok"]
+        print(json.dumps(descriptors, indent=2))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
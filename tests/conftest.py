@@ -37,7 +37,6 @@ def get_cn4_structure():
 
 @pytest.fixture(scope="module")
 def get_testdict():
-
     dct = {
         str(os.path.join(THIS_DIR, "test_files", "ABEXEM_clean.cif")): True,
         str(os.path.join(THIS_DIR, "test_files", "ABEXIQ_clean.cif")): True,
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Test the asyncio interface."""
+import asyncio
+import os
+import sys
+import time
+
+from mofchecker import MOFChecker
+from mofchecker.aio import acheck, acheck_many
+from mofchecker.checks.utils import run_subprocess
+
+from .conftest import THIS_DIR
+
+
+def test_acheck():
+    """The result is the same as for the blocking API."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    descriptors = ["name", "is_porous", "has_metal", "has_high_charges"]
+    result = asyncio.run(acheck(path, descriptors, index=2))
+    assert result["status"] == "ok"
+    assert result["index"] == 2
+    assert list(result["descriptors"]) == descriptors
+    assert result["descriptors"] == MOFChecker.from_cif(path).get_mof_descriptors(descriptors)
+
+
+def test_acheck_many():
+    """Results are yielded for all inputs, errors are recorded."""
+    paths = [
+        os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif"),
+        os.path.join(THIS_DIR, "test_files", "ABUBIK.cif"),
+        "does_not_exist.cif",
+    ]
+
+    async def collect():
+        return [result async for result in acheck_many(paths, ["has_metal"], workers=2)]
+
+    results = sorted(asyncio.run(collect()), key=lambda result: result["index"])
+    assert [result["input"] for result in results] == paths
+    assert [result["status"] for result in results] == ["ok", "error", "error"]
+
+
+def test_run_subprocess_cancel():
+    """Cancelling the awaiting task kills the subprocess."""
+
+    async def cancel():
+        task = asyncio.ensure_future(
+            run_subprocess([sys.executable, "-c", "import time; time.sleep(30)"])
+        )
+        await asyncio.sleep(0.5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    start = time.monotonic()
+    assert asyncio.run(cancel())
+    assert time.monotonic() - start < 10
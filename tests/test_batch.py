@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""Test running the checks on many structures."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from pymatgen.core import Structure
+
+from mofchecker import MOFChecker
+from mofchecker.batch import Checkpoint, check_many, check_one, iter_input_paths
+from mofchecker.batch.executors import PackedStructure, pack
+from mofchecker.batch.pool import SupervisedPool, parse_memory
+from mofchecker.batch.scheduling import (
+    MAX_WINDOW,
+    count_cif_atoms,
+    estimate_cost,
+    get_window,
+    longest_first,
+)
+from mofchecker.batch.sharding import in_shard, merge_results, parse_shard, shard_of
+
+from .conftest import THIS_DIR
+
+
+def test_check_one():
+    """Failures are recorded in the result row."""
+    result = check_one(os.path.join(THIS_DIR, "test_files", "ABUBIK.cif"), ["name"], index=3)
+    assert result["index"] == 3
+    assert result["status"] == "error"
+    assert result["error"].startswith("NotImplementedError")
+    assert result["descriptors"] is None
+
+
+def test_check_many():
+    """Run a small batch with a failing structure in a process pool."""
+    paths = [
+        os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif"),
+        os.path.join(THIS_DIR, "test_files", "ABUBIK.cif"),
+        Structure.from_file(os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")),
+    ]
+    results = list(MOFChecker.check_many(paths, descriptors=["has_metal"], workers=2))
+    assert len(results) == 3
+    results = sorted(results, key=lambda result: result["index"])
+    assert [result["status"] for result in results] == ["ok", "error", "ok"]
+    assert results[0]["input"] == paths[0]
+    assert results[0]["descriptors"] == {"has_metal": True}
+    assert results[2]["input"] is None
+
+
+def test_iter_input_paths(tmp_path):
+    """Directories, glob patterns and path lists are expanded."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "b").mkdir()
+    for path in [tmp_path / "x.cif", tmp_path / "a" / "y.CIF", tmp_path / "a" / "b" / "z.cif"]:
+        path.write_text("")
+    (tmp_path / "a" / "notes.txt").write_text("")
+
+    assert sorted(iter_input_paths([str(tmp_path)])) == sorted(
+        [
+            str(tmp_path / "x.cif"),
+            str(tmp_path / "a" / "y.CIF"),
+            str(tmp_path / "a" / "b" / "z.cif"),
+        ]
+    )
+    assert list(iter_input_paths([str(tmp_path / "*.cif")])) == [str(tmp_path / "x.cif")]
+    assert list(iter_input_paths(["missing.cif"])) == ["missing.cif"]
+
+    with open(tmp_path / "list.txt", "w") as handle:
+        handle.write(f"# comment\n\n{tmp_path / 'a' / 'b'}\n")
+    with open(tmp_path / "list.txt", "r") as handle:
+        assert list(iter_input_paths(from_file=handle)) == [str(tmp_path / "a" / "b" / "z.cif")]
+
+
+def _sleep_or_return(task):
+    if task == "sleep":
+        time.sleep(60)
+    if task == "allocate":
+        return len(bytearray(2 * 1024**3))
+    if task == "crash":
+        os._exit(1)  # pylint:disable=protected-access
+    return os.getpid()
+
+
+def test_supervised_pool_timeout():
+    """Workers that exceed the timeout are replaced."""
+    pool = SupervisedPool(_sleep_or_return, workers=2, timeout=2)
+    results = {
+        task: (status, payload) for task, status, payload in pool.imap_unordered(["sleep", 1, 2])
+    }
+    assert results["sleep"][0] == "timeout"
+    assert results[1][0] == results[2][0] == "ok"
+
+
+def test_supervised_pool_recycling():
+    """Workers are replaced after max_tasks_per_worker tasks."""
+    pool = SupervisedPool(_sleep_or_return, workers=1, max_tasks_per_worker=1)
+    pids = [payload for _, _, payload in pool.imap_unordered([1, 2, 3])]
+    assert len(set(pids)) == 3
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_supervised_pool_memory():
+    """Allocations beyond the memory limit give the oom status."""
+    with open("/proc/self/status", "r") as handle:
+        vm_size = [line for line in handle if line.startswith("VmSize")][0]
+    max_memory = int(vm_size.split()[1]) * 1024 + 512 * 1024**2
+    pool = SupervisedPool(_sleep_or_return, workers=1, max_memory=max_memory)
+    results = {task: status for task, status, _ in pool.imap_unordered(["allocate", 1])}
+    assert results == {"allocate": "oom", 1: "ok"}
+
+    # a worker that crashes is not out of memory
+    results = {task: status for task, status, _ in pool.imap_unordered(["crash", 1])}
+    assert results == {"crash": "error", 1: "ok"}
+
+
+def test_parse_memory():
+    assert parse_memory("4G") == 4 * 1024**3
+    assert parse_memory("512mb") == 512 * 1024**2
+    assert parse_memory(1024) == 1024
+    with pytest.raises(ValueError):
+        parse_memory("a lot")
+
+
+def test_checkpoint(tmp_path):
+    """Finished inputs are skipped when a run is resumed."""
+    path = tmp_path / "ABAVIJ_clean.cif"
+    path.write_text(open(os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")).read())
+    manifest = str(tmp_path / "manifest.db")
+
+    def run_paths(paths, descriptors=("has_metal",)):
+        return list(
+            check_many(
+                [str(path) for path in paths],
+                descriptors=list(descriptors),
+                workers=1,
+                checkpoint=manifest,
+            )
+        )
+
+    def run(descriptors=("has_metal",)):
+        return run_paths([path], descriptors)
+
+    assert len(run()) == 1
+    assert run() == []
+
+    # same content, different modification time
+    os.utime(path, ns=(0, 0))
+    assert run() == []
+
+    # other descriptors
+    assert len(run(["has_carbon"])) == 1
+
+    # changed content
+    path.write_text(path.read_text() + "\n")
+    assert len(run()) == 1
+
+    with Checkpoint(manifest, descriptors=["has_metal"]) as checkpoint:
+        assert checkpoint.is_finished(str(path))
+        assert not checkpoint.is_finished(os.path.join(THIS_DIR, "test_files", "ABUBIK.cif"))
+
+    # failed inputs are retried
+    broken = tmp_path / "broken.cif"
+    broken.write_text("data_broken\n")
+    assert [result["status"] for result in run_paths([broken])] == ["error"]
+    assert [result["status"] for result in run_paths([broken])] == ["error"]
+
+
+def test_sharding():
+    """Shards partition the inputs and do not change when files are added."""
+    paths = [f"structures/{i}.cif" for i in range(100)]
+    shards = [
+        [index for index, _ in in_shard(enumerate(paths), parse_shard(f"{i}/3"))] for i in range(3)
+    ]
+    assert sorted(sum(shards, [])) == list(range(100))
+    assert all(shards)
+
+    more_paths = paths + [f"structures/new_{i}.cif" for i in range(10)]
+    assert [shard_of(path, 3) for path in paths] == [shard_of(path, 3) for path in more_paths[:100]]
+
+    with pytest.raises(ValueError):
+        parse_shard("3/3")
+    with pytest.raises(ValueError):
+        parse_shard("a/b")
+
+
+def test_merge_results(tmp_path):
+    """Records are sorted by index and deduplicated by input."""
+    first = tmp_path / "shard_0.jsonl"
+    second = tmp_path / "shard_1.jsonl"
+    first.write_text(
+        '{"index": 2, "input": "c.cif", "status": "ok", "error": null, "descriptors": {}}\n'
+        '{"index": 0, "input": "a.cif", "status": "ok", "error": null, "descriptors": {}}\n'
+    )
+    second.write_text(
+        '{"index": 1, "input": "b.cif", "status": "ok", "error": null, "descriptors": {}}\n'
+        '{"index": 0, "input": "a.cif", "status": "error", "error": "x", "descriptors": null}\n'
+    )
+    merged = merge_results([str(first), str(second)])
+    assert [row["input"] for row in merged] == ["a.cif", "b.cif", "c.cif"]
+    assert merged[0]["status"] == "error"
+
+
+def test_scheduling(tmp_path):
+    """The atom count is estimated from the CIF text, large inputs come first."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    small = Structure.from_file(path)
+    assert count_cif_atoms(path) == len(small)
+    assert estimate_cost("does_not_exist.cif") == 0
+
+    # the file is only read up to the end of the first atom site loop
+    text = open(path).read()
+    two_blocks = tmp_path / "two_blocks.cif"
+    two_blocks.write_text(text + "\n" + text)
+    assert count_cif_atoms(str(two_blocks)) == len(small)
+
+    large = small * (2, 1, 1)
+    tasks = [(0, path), (1, small), (2, large)]
+    assert [index for index, _ in longest_first(tasks)] == [2, 0, 1]
+    # without buffer, the input order is kept
+    assert [index for index, _ in longest_first(tasks, window=0)] == [0, 1, 2]
+
+    # the window grows with the number of workers, up to a cap
+    assert get_window(2) == 8
+    assert get_window(10_000) == MAX_WINDOW
+
+
+@pytest.mark.parametrize("backend", ["serial", "thread", "process"])
+def test_backends(backend):
+    """All backends give the same results, also for pymatgen structures."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    inputs = [path, Structure.from_file(path)]
+    results = sorted(
+        check_many(inputs, ["has_metal", "formula"], workers=2, executor=backend),
+        key=lambda result: result["index"],
+    )
+    assert [result["input"] for result in results] == [path, None]
+    assert all(result["status"] == "ok" for result in results)
+    assert results[0]["descriptors"] == results[1]["descriptors"]
+
+
+def test_custom_executor():
+    """Executors are used as they are and not shut down."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(check_many([path, "missing.cif"], ["has_metal"], executor=executor))
+        assert sorted(result["status"] for result in results) == ["error", "ok"]
+        assert executor.submit(len, [1]).result() == 1
+
+    # invalid arguments are reported by the call, not on the first result
+    with pytest.raises(ValueError):
+        check_many([path], ["has_metal"], executor="thread", timeout=10)
+    with pytest.raises(ValueError):
+        check_many([path], ["has_metal"], executor="dask")
+    with pytest.raises(ValueError):
+        check_many([path], ["has_metal", "has_unicorns"])
+    for name in ("check_many", "get_mof_descriptors", "_set_cnn"):
+        with pytest.raises(ValueError):
+            check_many([path], [name])
+    with pytest.raises(ValueError):
+        check_many([path], ["has_metal"], shard="3/2")
+
+
+def test_broken_executor():
+    """All inputs get a result row if the executor breaks."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(BrokenProcessPool):
+            executor.submit(os._exit, 1).result()
+        results = list(check_many([path] * 5, ["has_metal"], workers=2, executor=executor))
+    assert sorted(result["index"] for result in results) == list(range(5))
+    assert {result["status"] for result in results} == {"error"}
+    assert all(result["error"].startswith("BrokenProcessPool") for result in results)
+
+
+def test_pack():
+    """Packed structures are rebuilt exactly."""
+    structure = Structure.from_file(os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif"))
+    packed = pack(structure)
+    assert isinstance(packed, PackedStructure)
+    assert packed.to_structure() == structure
+    assert pack("structure.cif") == "structure.cif"
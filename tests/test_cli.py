@@ -5,7 +5,7 @@ import pathlib
 
 from click.testing import CliRunner
 
-from mofchecker import cli
+from mofchecker import PROFILES, cli
 
 from .conftest import THIS_DIR
 
@@ -38,3 +38,94 @@ def test_select_descriptors():
     json_list = json.loads(result.output)
     assert len(json_list) == 1, json_list
     assert list(json_list[0].keys()) == ["has_metal"]
+
+
+def test_select_profile():
+    """Test that a profile selects its descriptors and that -d overrides it."""
+    runner = CliRunner()
+    path = str(TEST_DIR / "ABAVIJ_clean.cif")
+    result = runner.invoke(cli.run, [path, "--profile", "fast"])
+    assert result.exit_code == 0
+    assert list(json.loads(result.output)[0].keys()) == PROFILES["fast"]
+
+    result = runner.invoke(cli.run, [path, "--profile", "fast", "-d", "has_metal"])
+    assert result.exit_code == 0
+    assert list(json.loads(result.output)[0].keys()) == ["has_metal"]
+
+
+def test_prescreen():
+    """Test that structures that fail the pre-screen are rejected."""
+    runner = CliRunner()
+    paths = [str(TEST_DIR / "ABAVIJ_clean.cif"), str(TEST_DIR / "AHOKIR_clean.cif")]
+    result = runner.invoke(cli.run, paths + ["--prescreen", "-d", "has_metal", "--format", "jsonl"])
+    assert result.exit_code == 0
+    records = sorted(
+        (json.loads(line) for line in result.output.splitlines()), key=lambda r: r["index"]
+    )
+    assert [record["status"] for record in records] == ["ok", "rejected"]
+    assert "has_h" in records[1]["error"]
+
+
+def test_jsonl_output_with_jobs():
+    """Test the parallel mode with JSON Lines output."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.run,
+        [
+            str(TEST_DIR / "ABAVIJ_clean.cif"),
+            str(TEST_DIR / "ABUBIK.cif"),
+            "-d",
+            "has_metal",
+            "--jobs",
+            "2",
+            "--format",
+            "jsonl",
+        ],
+    )
+    assert result.exit_code == 0
+
+    records = sorted(
+        (json.loads(line) for line in result.output.splitlines() if line.startswith("{")),
+        key=lambda record: record["index"],
+    )
+    assert len(records) == 2, records
+    assert records[0]["input"] == str(TEST_DIR / "ABAVIJ_clean.cif")
+    assert records[0]["descriptors"] == {"has_metal": True}
+    assert records[1]["status"] == "error"
+
+
+def test_paths_from_stdin():
+    """Test reading the input paths from stdin."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.run,
+        ["--from-file", "-", "-d", "has_metal", "--format", "jsonl"],
+        input=f"{TEST_DIR / 'ABAVIJ_clean.cif'}\n",
+    )
+    assert result.exit_code == 0
+
+    records = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+    assert len(records) == 1, records
+    assert records[0]["descriptors"] == {"has_metal": True}
+
+
+def test_shard_and_merge(tmp_path):
+    """Run two shards and merge their outputs."""
+    runner = CliRunner()
+    paths = [str(TEST_DIR / "ABAVIJ_clean.cif"), str(TEST_DIR / "ABUBIK.cif")]
+    for shard in range(2):
+        result = runner.invoke(
+            cli.main,
+            paths + ["-d", "has_metal", "--format", "jsonl", "--shard", f"{shard}/2"],
+        )
+        assert result.exit_code == 0
+        lines = [line for line in result.output.splitlines() if line.startswith("{")]
+        (tmp_path / f"shard_{shard}.jsonl").write_text("\n".join(lines))
+
+    result = runner.invoke(
+        cli.main,
+        ["merge", str(tmp_path / "shard_0.jsonl"), str(tmp_path / "shard_1.jsonl")],
+    )
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [record["input"] for record in records] == paths
@@ -1,5 +1,25 @@
-"""Test checks on the structure graph."""
+"""Test the structure graph and the checks on it."""
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+from pymatgen.analysis.dimensionality import get_dimensionality_larsen
+from pymatgen.analysis.graphs import StructureGraph
+from pymatgen.core import Lattice, Structure
+from structuregraph_helpers.create import get_structure_graph as get_helpers_structure_graph
+
 from mofchecker.checks.global_structure.graphcheck import IsThreeDimensional
+from mofchecker.graph import (
+    NeighborList,
+    PeriodicAdjacency,
+    PeriodicComponents,
+    get_largest_cutoff,
+    get_structure_graph,
+    vesta_bonds,
+)
+
+from .conftest import THIS_DIR
 
 
 def test_is_three_dimensional(get_3d_structure_and_graph, get_1d_structure_and_graph):
@@ -15,3 +35,95 @@ def test_is_three_dimensional(get_3d_structure_and_graph, get_1d_structure_and_g
     assert not check.is_ok
     assert check.name == "3D connected structure graph."
     assert check.description == "Check if the structure graph is 3D connected."
+
+
+@pytest.mark.parametrize("name", ["AHOKIR_clean.cif", "MOF-74-Zn.cif", "ZADDAJ_clean.cif"])
+def test_fast_vesta(name):
+    """The vectorized bonding gives the same graph as the VESTA cutoffs of pymatgen."""
+    structure = Structure.from_file(os.path.join(THIS_DIR, "test_files", name))
+    expected = get_helpers_structure_graph(structure, "vesta")
+    graph = get_structure_graph(structure, "vesta")
+    assert nx.utils.graphs_equal(get_structure_graph(structure, "fast_vesta").graph, graph.graph)
+    assert nx.utils.graphs_equal(graph.graph, expected.graph)
+    assert sorted(map(str, graph.graph.edges(keys=True, data=True))) == sorted(
+        map(str, expected.graph.edges(keys=True, data=True))
+    )
+
+
+def test_fast_vesta_periodic_images():
+    """Bonds to periodic images of the same site are added once."""
+    structure = Structure(Lattice.cubic(1.5), ["C", "O"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+    expected = get_helpers_structure_graph(structure, "vesta")
+    graph = get_structure_graph(structure, "vesta")
+    assert graph.graph.number_of_edges() == expected.graph.number_of_edges() > 0
+    assert nx.utils.graphs_equal(graph.graph, expected.graph)
+
+    bonds, images = vesta_bonds(structure)
+    assert len(bonds) == len(images) == graph.graph.number_of_edges()
+    assert (bonds[:, 0] <= bonds[:, 1]).all()
+
+
+def test_periodic_adjacency(get_1d_structure_and_graph):
+    """The compact adjacency has the same neighbors as the connected sites."""
+    structure, graph = get_1d_structure_and_graph
+    adjacency = PeriodicAdjacency.from_structure_graph(graph)
+    assert len(adjacency.indptr) == len(structure) + 1
+    assert adjacency.images.dtype == np.int8
+    for index in range(len(structure)):
+        connected_sites = graph.get_connected_sites(index)
+        assert adjacency.get_cn(index) == len(connected_sites)
+        assert sorted(adjacency.get_neighbors(index).tolist()) == sorted(
+            site.index for site in connected_sites
+        )
+        row = slice(adjacency.indptr[index], adjacency.indptr[index + 1])
+        assert np.allclose(adjacency.distances[row], [site.dist for site in connected_sites])
+
+
+def test_shared_neighbor_list(get_1d_structure_and_graph):
+    """Graphs with smaller cutoffs are subsets of the ones with larger cutoffs."""
+    structure, _graph = get_1d_structure_and_graph
+    radius = get_largest_cutoff(structure, [("covalent_radius", 0.1), ("covalent_radius", 0.3)])
+    neighbor_list = NeighborList.from_structure(structure, radius)
+    tight = get_structure_graph(structure, "covalent_radius", 0.1, neighbor_list)
+    loose = get_structure_graph(structure, "covalent_radius", 0.3, neighbor_list)
+    assert set(tight.graph.edges) < set(loose.graph.edges)
+    assert nx.utils.graphs_equal(
+        get_structure_graph(structure, "covalent_radius", 0.1).graph, tight.graph
+    )
+
+    with pytest.raises(ValueError):
+        get_structure_graph(structure, "covalent_radius", 0.5, neighbor_list)
+    with pytest.raises(ValueError):
+        get_structure_graph(structure, "voronoi", 0.1)
+
+
+def test_periodic_components(get_3d_structure_and_graph, get_1d_structure_and_graph):
+    """Components and dimensionality from the net images of the cycles."""
+    structure = Structure(
+        Lattice.cubic(10),
+        ["Cu", "Cu", "O", "C", "C", "O", "H"],
+        [[0, 0, 0], [0.5, 0, 0], [0.2, 0.5, 0.5], [0.98, 0.5, 0.2], [0.02, 0.5, 0.2]]
+        + [[0.5, 0.5, 0.5], [0.5, 0.5, 0.6]],
+    )
+    graph = StructureGraph.with_empty_graph(structure)
+    # chain along a: 0 - 1 - 0 (next cell)
+    graph.add_edge(0, 1, to_jimage=(0, 0, 0))
+    graph.add_edge(1, 0, to_jimage=(1, 0, 0))
+    # layer: site 2 bonded to its own images along b and c
+    graph.add_edge(2, 2, to_jimage=(0, 1, 0))
+    graph.add_edge(2, 2, to_jimage=(0, 0, 1))
+    # molecules: one across the cell boundary and one inside the cell
+    graph.add_edge(3, 4, to_jimage=(1, 0, 0))
+    graph.add_edge(5, 6, to_jimage=(0, 0, 0))
+
+    components = PeriodicComponents.from_adjacency(PeriodicAdjacency.from_structure_graph(graph))
+    assert components.components == [[0, 1], [2], [3, 4], [5, 6]]
+    assert components.dimensionalities == [1, 2, 0, 0]
+    assert components.dimensionality == 2
+    assert components.get_floating_components() == [[3, 4], [5, 6]]
+
+    for _structure, graph in (get_3d_structure_and_graph, get_1d_structure_and_graph):
+        components = PeriodicComponents.from_adjacency(
+            PeriodicAdjacency.from_structure_graph(graph)
+        )
+        assert components.dimensionality == get_dimensionality_larsen(graph)
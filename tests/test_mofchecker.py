@@ -1,12 +1,24 @@
 # -*- coding: utf-8 -*-
 """Tests of mofchecker."""
 import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 
+import networkx as nx
 import pytest
 from ase.io import read
 from pymatgen.core import Structure
+from structuregraph_helpers.create import get_structure_graph as get_helpers_structure_graph
 
-from mofchecker import MOFChecker
+import mofchecker as mofchecker_module
+from mofchecker import DESCRIPTORS, MOFChecker, prescreen
+from mofchecker.checks.charge_check import ChargeCheck
+from mofchecker.checks.zeopp import PorosityCheck
+from mofchecker.descriptors import ARTIFACTS, PROFILES, get_profile, plan_artifacts
+from mofchecker.errors import PrescreenFailed
+from mofchecker.graph import NeighborList
+from mofchecker.symmetry import ANGLE_TOLERANCE, SYMPREC, get_symmetry_dataset
 
 from .conftest import THIS_DIR
 
@@ -192,3 +204,245 @@ def test_chargecheck():
 def test_is_porous(get_cn5_paddlewheel_structure):
     mc = MOFChecker(get_cn5_paddlewheel_structure)
     assert mc.is_porous is True
+
+
+def test_lazy_checks():
+    """Checks and the structure graph are only created when they are needed."""
+    mofchecker = MOFChecker.from_cif(os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif"))
+    assert len(mofchecker.checks) == 19
+    assert mofchecker.get_mof_descriptors(["density", "formula", "has_metal"])
+    assert mofchecker._graph is None
+    assert mofchecker.checks.is_created("has_metal")
+    assert not mofchecker.checks.is_created("no_oms")
+
+    assert mofchecker.graph_hash == "96d2ad2ce950e97f7aa16d697aa8ca72"
+    assert mofchecker._graph is not None
+    assert mofchecker.checks["no_oms"] is mofchecker.checks["no_oms"]
+
+
+def test_descriptor_planning():
+    """Only the artifacts that the descriptors depend on are built."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    assert plan_artifacts(["symmetry_hash", "has_metal"]) == ["symmetry"]
+    assert plan_artifacts(DESCRIPTORS) == list(ARTIFACTS)
+
+    mofchecker = MOFChecker.from_cif(path)
+    mofchecker.get_mof_descriptors(["symmetry_hash", "has_metal", "has_overcoordinated_h"])
+    assert mofchecker._graph is None
+    assert "distance_matrix" not in mofchecker.__dict__
+
+    mofchecker = MOFChecker.from_cif(path)
+    mofchecker.get_mof_descriptors(["graph_hash", "has_atomic_overlaps"])
+    assert (SYMPREC, ANGLE_TOLERANCE) not in mofchecker._symmetry_datasets
+    assert "distance_matrix" in mofchecker.__dict__
+
+
+def test_profiles():
+    """Profiles are nested and the cheaper profiles avoid the expensive artifacts."""
+    assert PROFILES["full"] == DESCRIPTORS
+    assert set(PROFILES["fast"]) < set(PROFILES["standard"]) < set(PROFILES["full"])
+    assert plan_artifacts(get_profile("fast")) == ["graph", "distance_matrix"]
+    assert plan_artifacts(get_profile("standard")) == ["graph", "symmetry", "distance_matrix"]
+    with pytest.raises(ValueError):
+        get_profile("cheap")
+
+
+def test_passes():
+    """Screening stops at the first failed check."""
+    mofchecker = MOFChecker.from_cif(os.path.join(THIS_DIR, "test_files", "AHOKIR_clean.cif"))
+    # AHOKIR has no hydrogen, the structure graph is not needed to reject it
+    assert mofchecker.passes() == (False, ["has_h"])
+    assert mofchecker._graph is None
+    assert not mofchecker.checks.is_created("is_porous")
+    failed = mofchecker.passes(fail_fast=False)[1]
+    assert failed[:2] == ["has_h", "no_undercoordinated_carbon"]
+
+    assert mofchecker.passes(["has_metal", "has_c"]) == (True, [])
+    passed, failed = mofchecker.passes(["has_3d_connected_graph", "no_undercoordinated_carbon"])
+    assert not passed and failed == ["no_undercoordinated_carbon"]
+    with pytest.raises(ValueError):
+        mofchecker.passes(["no_missing_atoms"])
+
+
+def test_defer_symmetrization(monkeypatch):
+    """Deferring the symmetry analysis does not change the descriptors."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    descriptors = ["graph_hash", "symmetry_hash", "formula", "has_lone_molecule"]
+    reference = MOFChecker.from_cif(path, primitive=True).get_mof_descriptors(descriptors)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The structure should not be symmetrized")
+
+    monkeypatch.setattr(mofchecker_module, "SpacegroupAnalyzer", fail)
+    mofchecker = MOFChecker.from_cif(path, primitive=True, defer_symmetrization=True)
+    assert mofchecker.get_mof_descriptors(descriptors) == reference
+
+
+def test_prescreen(monkeypatch):
+    """Structures that fail the pre-screen are rejected before the symmetry analysis."""
+    structure = Structure.from_file(os.path.join(THIS_DIR, "test_files", "AHOKIR_clean.cif"))
+    assert prescreen(structure) == (False, ["has_h"])
+    structure = Structure.from_file(os.path.join(THIS_DIR, "test_files", "ABUBIK.cif"))
+    assert prescreen(structure) == (False, ["is_ordered"])
+    structure = Structure.from_file(os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif"))
+    assert prescreen(structure) == (True, [])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The structure should not be symmetrized")
+
+    monkeypatch.setattr(mofchecker_module, "SpacegroupAnalyzer", fail)
+    path = os.path.join(THIS_DIR, "test_files", "AHOKIR_clean.cif")
+    with pytest.raises(PrescreenFailed) as excinfo:
+        MOFChecker.from_cif(path, prescreen=True)
+    assert excinfo.value.failed == ["has_h"]
+
+
+def test_background_tools(monkeypatch):
+    """zeo++ and EqEq run at the same time, in threads other than the main thread."""
+    barrier = threading.Barrier(2, timeout=10)
+    threads = []
+
+    def run_tool(self):
+        threads.append(threading.current_thread())
+        barrier.wait()
+        return True
+
+    monkeypatch.setattr(PorosityCheck, "_run_check", run_tool)
+    monkeypatch.setattr(ChargeCheck, "_run_check", run_tool)
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    mofchecker = MOFChecker.from_cif(path, background_tools=True)
+    descriptors = mofchecker.get_mof_descriptors(["is_porous", "has_high_charges", "graph_hash"])
+    assert descriptors["is_porous"] and not descriptors["has_high_charges"]
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+
+def test_threads():
+    """One instance can be checked from several threads without changing global state."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    descriptors = ["graph_hash", "has_lone_molecule", "has_undercoordinated_c", "has_metal"]
+    reference = MOFChecker.from_cif(path).get_mof_descriptors(descriptors)
+
+    filters = list(warnings.filters)
+    mofchecker = MOFChecker.from_cif(path)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: mofchecker.get_mof_descriptors(descriptors), range(4)))
+    assert all(result == reference for result in results)
+    assert warnings.filters == filters
+    # the shared graph is not copied or modified by the checks
+    assert mofchecker.checks["no_floating_molecule"].structure_graph is mofchecker.graph
+
+
+def test_cif_warnings():
+    """The warnings of reading a CIF are suppressed without changing the filters."""
+    path = os.path.join(THIS_DIR, "test_files", "TONTIB_clean.cif")
+    # importing mofchecker does not add filters
+    assert not [entry for entry in warnings.filters if "pymatgen" in str(entry[3])]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        filters = list(warnings.filters)
+        MOFChecker.from_cif(path, defer_symmetrization=True)
+        assert warnings.filters == filters
+    assert not caught
+
+
+def test_symmetry_analysis_is_reused(monkeypatch):
+    """The symmetry analysis only runs again for other tolerances."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    descriptors = ["symmetry_hash", "spacegroup_symbol", "spacegroup_number"]
+    reference = MOFChecker.from_cif(path).get_mof_descriptors(descriptors)
+
+    calls = []
+
+    def count_calls(structure, *args):
+        calls.append(args)
+        return get_symmetry_dataset(structure, *args)
+
+    monkeypatch.setattr(mofchecker_module, "get_symmetry_dataset", count_calls)
+    mofchecker = MOFChecker.from_cif(path, symprec=SYMPREC, angle_tolerance=ANGLE_TOLERANCE)
+    assert mofchecker.get_mof_descriptors(descriptors) == reference
+    assert not calls
+
+    mofchecker = MOFChecker.from_cif(path)
+    assert mofchecker.get_mof_descriptors(descriptors) == reference
+    assert mofchecker.get_mof_descriptors(descriptors) == reference
+    mofchecker.get_symmetry_dataset(symprec=0.1)
+    assert calls == [(SYMPREC, ANGLE_TOLERANCE), (0.1, ANGLE_TOLERANCE)]
+
+
+def test_fast_vesta():
+    """The default bonding method uses the vectorized engine, fast_vesta is an alias."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    descriptors = [name for name in PROFILES["standard"] if name != "symmetry_hash"]
+    mofchecker = MOFChecker.from_cif(path)
+    reference = mofchecker.get_mof_descriptors(descriptors)
+    expected = get_helpers_structure_graph(mofchecker.structure, "vesta")
+    assert nx.utils.graphs_equal(mofchecker.graph.graph, expected.graph)
+
+    mofchecker._set_cnn("fast_vesta")
+    assert mofchecker.get_mof_descriptors(descriptors) == reference
+
+
+def test_coordination_numbers():
+    """The coordination numbers of all sites are computed at once."""
+    mofchecker = MOFChecker.from_cif(os.path.join(THIS_DIR, "test_files", "AHOKIR_clean.cif"))
+    coordination_numbers = mofchecker.coordination_numbers
+    graph = mofchecker.graph
+    assert coordination_numbers.tolist() == [
+        len(graph.get_connected_sites(index)) for index in range(len(coordination_numbers))
+    ]
+    assert mofchecker.get_cn(0) == coordination_numbers[0]
+    assert mofchecker.coordination_numbers is coordination_numbers
+    with pytest.raises(ValueError):
+        coordination_numbers[0] = 0
+    assert mofchecker.checks["no_oms"].coordination_numbers is coordination_numbers
+
+
+def test_components():
+    """The floating molecule and the dimensionality checks share one component analysis."""
+    mofchecker = MOFChecker(
+        Structure.from_file(os.path.join(THIS_DIR, "test_files", "HKUST_floating.cif"))
+    )
+    components = mofchecker.components
+    assert components.dimensionality == 3
+    assert components.get_floating_components() == [[144]]
+    assert mofchecker.checks["no_floating_molecule"].components is components
+    assert mofchecker.checks["has_3d_connected_graph"].components is components
+    assert mofchecker.has_lone_molecule is True
+
+
+def test_bonding_methods(monkeypatch):
+    """The graphs of several bonding methods are derived from one neighbor search."""
+    searches = []
+    from_structure = NeighborList.from_structure.__func__
+
+    def count_searches(cls, structure, radius):
+        searches.append(radius)
+        return from_structure(cls, structure, radius)
+
+    monkeypatch.setattr(NeighborList, "from_structure", classmethod(count_searches))
+    mofchecker = MOFChecker.from_cif(os.path.join(THIS_DIR, "test_files", "AHOKIR_clean.cif"))
+    methods = ["vesta", ("covalent_radius", 0.0), ("covalent_radius", 0.3)]
+    report = mofchecker.compare_bonding(methods)
+    assert len(searches) == 1
+    assert report[0]["coordination_numbers"] == {
+        "vesta": 2,
+        "covalent_radius:0.0": 0,
+        "covalent_radius:0.3": 2,
+    }
+    assert report[0]["disputed_bonds"][0]["methods"] == ["vesta", "covalent_radius:0.3"]
+    assert 6 not in report
+
+    # the graphs are kept and the checks use the graph of the selected method
+    vesta_graph = mofchecker.graph
+    assert not mofchecker.checks["no_undercoordinated_carbon"].is_ok
+    mofchecker._set_cnn("covalent_radius", 0.0)
+    assert mofchecker.graph is mofchecker.get_graph("covalent_radius", 0.0)
+    assert mofchecker.coordination_numbers[:4].tolist() == [0, 0, 0, 0]
+    assert mofchecker.checks["no_undercoordinated_carbon"].is_ok
+    assert len(searches) == 1
+    mofchecker._set_cnn("vesta")
+    assert mofchecker.graph is vesta_graph
+    assert not mofchecker.checks["no_undercoordinated_carbon"].is_ok
+
+    with pytest.raises(ValueError):
+        mofchecker._set_cnn("voronoi", 0.1)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Test the local service and its client."""
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import mofchecker_client
+from mofchecker.server import CheckService, is_loopback, make_server
+
+from .conftest import THIS_DIR
+
+
+@pytest.fixture(scope="module")
+def service():
+    """Start a service with one worker."""
+    service = CheckService(workers=1, max_queue=2)
+    service.start()
+    yield service
+    service.close()
+
+
+@contextlib.contextmanager
+def _serve(service, **kwargs):
+    server = make_server(service, port=0, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="module")
+def service_url(service):
+    """Run the service in a background thread."""
+    with _serve(service) as url:
+        yield url
+
+
+def test_client(service_url):
+    """Files can be sent as content or as path."""
+    paths = [
+        os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif"),
+        os.path.join(THIS_DIR, "test_files", "ABUBIK.cif"),
+    ]
+    results = mofchecker_client.check(paths, url=service_url, descriptors=["name", "has_metal"])
+    assert [result["input"] for result in results] == paths
+    assert [result["status"] for result in results] == ["ok", "error"]
+    assert results[0]["descriptors"] == {"name": "ABAVIJ_clean", "has_metal": True}
+
+    results = mofchecker_client.check(
+        paths[:1], url=service_url, descriptors=["name"], send_paths=True
+    )
+    assert results[0]["descriptors"] == {"name": "ABAVIJ_clean"}
+
+
+def test_rejected_requests(service_url):
+    """Requests beyond the queue limit and invalid requests are rejected."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    with pytest.raises(RuntimeError, match="503"):
+        mofchecker_client.check([path] * 3, url=service_url, descriptors=["name"])
+    with pytest.raises(RuntimeError, match="400"):
+        mofchecker_client.check([path], url=service_url, descriptors=["not_a_descriptor"])
+    for descriptors in (5, "name", [5]):
+        with pytest.raises(RuntimeError, match="400"):
+            mofchecker_client.check([path], url=service_url, descriptors=descriptors)
+
+
+def test_paths_only_on_loopback(service):
+    """Paths are only read by servers on a loopback address or if allowed explicitly."""
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+    assert not is_loopback("0.0.0.0") and not is_loopback("") and not is_loopback("example.org")
+
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    with _serve(service, allow_paths=False) as url:
+        with pytest.raises(RuntimeError, match="403"):
+            mofchecker_client.check([path], url=url, descriptors=["name"], send_paths=True)
+        results = mofchecker_client.check([path], url=url, descriptors=["name"])
+        assert results[0]["status"] == "ok"
+
+
+def test_request_timeout(service):
+    """Requests fail if their results are not ready in time."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    with _serve(service, request_timeout=1e-6) as url:
+        with pytest.raises(RuntimeError, match="504"):
+            mofchecker_client.check([path], url=url, descriptors=["name"])
+    # the structure is still checked
+    while service.depth:
+        time.sleep(0.05)
+
+
+def test_dead_worker():
+    """The workers are replaced if one of them dies."""
+    path = os.path.join(THIS_DIR, "test_files", "ABAVIJ_clean.cif")
+    service = CheckService(workers=1)
+    service.start()
+    try:
+        with pytest.raises(BrokenProcessPool):
+            service._executor.submit(os._exit, 1).result()  # pylint:disable=protected-access
+        with _serve(service) as url:
+            results = mofchecker_client.check([path], url=url, descriptors=["name"])
+        assert results[0]["status"] == "ok"
+    finally:
+        service.close()
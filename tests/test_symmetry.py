@@ -6,7 +6,12 @@ from pymatgen.core import Structure
 from pymatgen.transformations.standard_transformations import RotationTransformation
 
 from mofchecker import MOFChecker
-from mofchecker.symmetry import get_symmetry_hash
+from mofchecker.symmetry import (
+    get_spacegroup_symbol_and_number,
+    get_symmetrized_structure,
+    get_symmetry_dataset,
+    get_symmetry_hash,
+)
 
 from .conftest import THIS_DIR
 
@@ -40,3 +45,16 @@ def test_get_symmetry_hash():
     # create supercell
     structure.make_supercell([1, 2, 1])
     assert get_symmetry_hash(MOFChecker(structure).structure) == original_hash
+
+
+def test_spglib_dataset():
+    """The spglib dataset gives the same descriptors as the symmetrized structure."""
+    for name in ["ZIF-3.cif", "ABAXUZ.cif", "ABAVIJ_clean.cif"]:
+        structure = MOFChecker.from_cif(os.path.join(THIS_DIR, "test_files", name)).structure
+        symmetrized = get_symmetrized_structure(structure)
+        for tight in (True, False):
+            assert get_symmetry_hash(structure, tight) == get_symmetry_hash(symmetrized, tight)
+        assert get_spacegroup_symbol_and_number(structure) == get_spacegroup_symbol_and_number(
+            symmetrized
+        )
+        assert get_symmetry_dataset(structure).wyckoff_letters == symmetrized.wyckoff_letters